@@ -3,16 +3,18 @@
 from pathlib import Path
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
 from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
 
 from app.services.image_service import ImageService
 from app.core.auth import get_current_user
 from app.config import settings
 
 router = APIRouter()
+image_service = ImageService()
 
-# Dependency to get image service
+# Dependency to get image service (shared, so its cached paths persist)
 def get_image_service() -> ImageService:
-    return ImageService()
+    return image_service
 
 
 @router.post("/upload", response_model=dict)
@@ -36,7 +38,8 @@ async def upload_image(
         HTTPException: 400 for invalid file, 500 for server errors
     """
     try:
-        image_path = image_service.upload_image(file)
+        # Disk I/O runs in a worker thread so the event loop stays free
+        image_path = await run_in_threadpool(image_service.upload_image, file)
         return {
             "message": "Image uploaded successfully",
             "path": image_path
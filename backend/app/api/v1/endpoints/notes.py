@@ -1,14 +1,20 @@
 """Notes API endpoints."""
 
+import asyncio
+import logging
 from typing import Dict, List, Optional, Union
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 
 from app.core.auth import get_current_user
 from app.services.file_service import FileService
 from app.services.git_service import GitService
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 file_service = FileService()
 git_service = GitService()
@@ -94,14 +100,22 @@ class RestoreRequest(BaseModel):
 
 
 @router.get("/", response_model=FileTreeNode)
-async def list_notes(current_user: str = Depends(get_current_user)):
+async def list_notes(
+    stream: bool = Query(False, description="Stream the tree as it is read"),
+    current_user: str = Depends(get_current_user)
+):
     """
     List all notes in a tree structure.
     
+    Args:
+        stream: Serialize the tree incrementally instead of building it in memory
+        
     Returns:
         FileTreeNode: Hierarchical file tree structure
     """
     try:
+        if stream:
+            return StreamingResponse(file_service.list_notes_stream(), media_type="application/json")
         return file_service.list_notes()
     except Exception as e:
         raise HTTPException(
@@ -155,20 +169,18 @@ async def get_file_history(path: str, current_user: str = Depends(get_current_us
     Raises:
         HTTPException: 404 if file not found, 400 if invalid path or git error
     """
-    import logging
-    logger = logging.getLogger(__name__)
-    
     try:
-        logger.info(f"Getting history for path: {repr(path)}")
+        logger.debug("Getting history for path: %r", path)
         # Validate file exists
         file_service.get_note(path)
         
-        # Get commit history
-        commits = git_service.get_file_commits(path)
-        logger.info(f"Found {len(commits)} commits for path: {repr(path)}")
-        
-        # Get current commit hash
-        current_commit_hash = git_service.get_current_commit_for_file(path)
+        # Get commit history and the current commit hash; they are
+        # independent git lookups, so run them side by side
+        commits, current_commit_hash = await asyncio.gather(
+            run_in_threadpool(git_service.get_file_commits, path),
+            run_in_threadpool(git_service.get_current_commit_for_file, path)
+        )
+        logger.debug("Found %d commits for path: %r", len(commits), path)
         
         # Mark current commit
         commit_info_list = []
@@ -222,12 +234,13 @@ async def get_file_content_at_commit(
         # Validate file exists
         file_service.get_note(path)
         
-        # Get commit info to get timestamp
-        commits = git_service.get_file_commits(path)
+        # Get commit info to get timestamp; the recent history shown in the
+        # UI usually has it, otherwise search the full history
         commit_info = None
-        for commit in commits:
-            if commit["hash"] == commit_hash:
-                commit_info = commit
+        for lookup in ({}, {"limit": None, "follow": True}):
+            commits = git_service.get_file_commits(path, **lookup)
+            commit_info = next((c for c in commits if c["hash"] == commit_hash), None)
+            if commit_info:
                 break
         
         if not commit_info:
@@ -288,7 +301,9 @@ async def commit_file(path: str, current_user: str = Depends(get_current_user)):
         file_service.get_note(path)
         
         # Commit the file
-        success = git_service.commit_single_file(path)
+        # In the threadpool, so waiting on a background commit for the
+        # git write lock doesn't block the event loop
+        success = await run_in_threadpool(git_service.commit_single_file, path)
         
         if not success:
             raise HTTPException(
@@ -347,7 +362,7 @@ async def restore_file_from_commit(
         file_service.get_note(path)
         
         # Ensure current state is committed first
-        git_service.commit_single_file(path)
+        await run_in_threadpool(git_service.commit_single_file, path)
         
         # Get file content at the specified commit
         content = git_service.get_file_content_at_commit(path, restore_request.commit_hash)
@@ -356,7 +371,7 @@ async def restore_file_from_commit(
         file_service.update_note(path, content)
         
         # Commit the restored version
-        git_service.commit_single_file(path)
+        await run_in_threadpool(git_service.commit_single_file, path)
         
         return NoteResponse(
             message=f"File restored from commit {restore_request.commit_hash[:8]}",
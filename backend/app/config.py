@@ -1,5 +1,6 @@
 """Configuration module for KBase backend."""
 
+import importlib.util
 import os
 from pathlib import Path
 from typing import Optional
@@ -12,6 +13,10 @@ from pydantic_settings import BaseSettings
 load_dotenv()
 
 
+# Prefixes of bcrypt hashes; a PASSWORD starting with one is verified with bcrypt
+BCRYPT_HASH_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+
 def _is_development_mode() -> bool:
     """
     Detect if running in development mode.
@@ -47,7 +52,7 @@ class Settings(BaseSettings):
     # Can be explicitly set via DISABLE_AUTH environment variable
     disable_auth: Optional[bool] = Field(default=None, description="Disable authentication (defaults to True in dev mode, False in production)")
     secret_key: str = Field(default="", description="Secret key for JWT token signing (required if auth is enabled)")
-    password: str = Field(default="", description="Plain text password for authentication (required if auth is enabled)")
+    password: str = Field(default="", description="Password or bcrypt hash for authentication (required if auth is enabled)")
     access_token_expire_minutes: int = Field(default=10080, description="Access token expiration time in minutes (default: 7 days)")
     algorithm: str = Field(default="HS256", description="JWT signing algorithm")
     
@@ -79,6 +84,8 @@ class Settings(BaseSettings):
                 raise ValueError("SECRET_KEY is required when authentication is enabled")
             if not self.password:
                 raise ValueError("PASSWORD is required when authentication is enabled")
+            if self.password.startswith(BCRYPT_HASH_PREFIXES) and importlib.util.find_spec("bcrypt") is None:
+                raise ValueError("PASSWORD is a bcrypt hash but the bcrypt package is not installed")
         return self
     
     model_config = {
@@ -1,34 +1,101 @@
 """Authentication utilities for JWT token handling."""
 
-from datetime import datetime, timedelta, timezone
-from typing import Optional
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Optional, Tuple
 
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPBearer
 from jose import JWTError, jwt
 
-from app.config import settings
+from app.config import BCRYPT_HASH_PREFIXES, settings
 
-# HTTP Bearer token scheme - auto_error is False when auth is disabled
-def get_security():
-    """Get HTTPBearer security scheme with appropriate auto_error setting."""
-    return HTTPBearer(auto_error=not settings.disable_auth)
 
-security = get_security()
+def _base64url_encode(data: bytes) -> bytes:
+    """Encode bytes as unpadded base64url, as used by JWT segments."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# Encoded header segment of every HS256 token we issue; it never changes
+_HS256_HEADER_SEGMENT = _base64url_encode(b'{"alg":"HS256","typ":"JWT"}')
+
+# Claims create_access_token puts in tokens; others go through the full decoder
+_ISSUED_CLAIMS = frozenset({"sub", "exp"})
+
+# Authorization header prefix, compared case-insensitively against the raw header bytes
+_BEARER_PREFIX = b"bearer "
+_BEARER_PREFIX_LEN = len(_BEARER_PREFIX)
+
+
+class BearerTokenScheme(HTTPBearer):
+    """
+    HTTP Bearer scheme that reads the token straight from the ASGI scope.
+    
+    Keeps the OpenAPI security definition of HTTPBearer but skips building a
+    headers mapping and a credentials model on every request. Whether a
+    missing token is an error is left to get_current_user, which checks the
+    current settings.
+    """
+    
+    def __init__(self):
+        super().__init__(scheme_name="HTTPBearer", auto_error=False)
+    
+    async def __call__(self, request: Request) -> Optional[str]:
+        """
+        Extract the bearer token from the Authorization header.
+        
+        Args:
+            request: The incoming request
+            
+        Returns:
+            Optional[str]: The token, or None if the header is missing or not a bearer token
+        """
+        for name, value in request.scope["headers"]:
+            if name == b"authorization":
+                if len(value) > _BEARER_PREFIX_LEN and value[:_BEARER_PREFIX_LEN].lower() == _BEARER_PREFIX:
+                    return value[_BEARER_PREFIX_LEN:].decode("latin-1")
+                return None
+        return None
+
+
+# HTTP Bearer token scheme
+security = BearerTokenScheme()
+
+# Recently verified tokens: (token, secret key, algorithm) -> (user id, valid until).
+# Entries live for a few seconds and never past the token's own expiry, so repeat
+# requests skip the signature check and payload decode
+_TOKEN_CACHE_SIZE = 10000
+_TOKEN_CACHE_TTL = 5.0
+_token_cache: "OrderedDict[Tuple[str, str, str], Tuple[str, float]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
 
 
 def verify_password(plain_password: str, stored_password: str) -> bool:
     """
     Verify a plain text password against the stored password.
     
+    The stored password may be plain text or a bcrypt hash.
+    
     Args:
         plain_password: The plain text password to verify
-        stored_password: The stored password to compare against
+        stored_password: The stored password or bcrypt hash to compare against
         
     Returns:
         bool: True if password matches, False otherwise
     """
-    return plain_password == stored_password
+    if stored_password.startswith(BCRYPT_HASH_PREFIXES):
+        # Only needed when PASSWORD holds a hash; settings validation checks it is installed
+        import bcrypt
+        return bcrypt.checkpw(plain_password.encode("utf-8"), stored_password.encode("utf-8"))
+    
+    # Constant-time comparison so response timing does not leak how much of the password matched
+    return hmac.compare_digest(plain_password.encode("utf-8"), stored_password.encode("utf-8"))
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -44,13 +111,63 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     """
     to_encode = data.copy()
     if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
+        lifetime = expires_delta.total_seconds()
     else:
-        expire = datetime.now(timezone.utc) + timedelta(minutes=settings.access_token_expire_minutes)
+        lifetime = settings.access_token_expire_minutes * 60
+    
+    # exp is a plain epoch timestamp, so no datetime objects are needed
+    to_encode.update({"exp": int(time.time() + lifetime)})
+    if settings.algorithm != "HS256":
+        return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    
+    # HS256 is all we issue by default: sign with the fixed header segment directly
+    # instead of going through jose's generic header and key handling
+    payload_segment = _base64url_encode(json.dumps(to_encode, separators=(",", ":")).encode("utf-8"))
+    signing_input = _HS256_HEADER_SEGMENT + b"." + payload_segment
+    signature = hmac.new(settings.secret_key.encode("utf-8"), signing_input, hashlib.sha256).digest()
+    return (signing_input + b"." + _base64url_encode(signature)).decode("ascii")
+
+
+def _decode_issued_token(token: str, secret_key: str) -> Optional[dict]:
+    """
+    Verify a token shaped exactly like the ones create_access_token issues.
     
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
-    return encoded_jwt
+    Handles the common case without jose: our fixed HS256 header, a valid
+    signature, and only sub/exp claims with exp in the future. Anything else,
+    including every invalid token, is left to the full decoder so it keeps
+    deciding what is accepted.
+    
+    Args:
+        token: The JWT token to verify
+        secret_key: The HMAC signing key
+        
+    Returns:
+        Optional[dict]: The claims if the token passed, None if it needs the full decoder
+    """
+    try:
+        signing_input, _, signature = token.encode("ascii").rpartition(b".")
+        header_segment, _, payload_segment = signing_input.partition(b".")
+        if header_segment != _HS256_HEADER_SEGMENT:
+            return None
+        
+        expected = hmac.new(secret_key.encode("utf-8"), signing_input, hashlib.sha256).digest()
+        if not hmac.compare_digest(_base64url_encode(expected), signature):
+            return None
+        
+        claims = json.loads(base64.urlsafe_b64decode(payload_segment + b"=" * (-len(payload_segment) % 4)))
+    except ValueError:
+        # Covers non-ASCII tokens, bad base64 and malformed JSON
+        return None
+    
+    if not isinstance(claims, dict) or claims.keys() - _ISSUED_CLAIMS:
+        return None
+    sub = claims.get("sub")
+    if sub is not None and not isinstance(sub, str):
+        return None
+    exp = claims.get("exp")
+    if type(exp) is not int or exp < time.time():
+        return None
+    return claims
 
 
 def verify_token(token: str) -> Optional[str]:
@@ -63,14 +180,37 @@ def verify_token(token: str) -> Optional[str]:
     Returns:
         Optional[str]: The user identifier if token is valid, None otherwise
     """
-    try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-        user_id: str = payload.get("sub")
-        if user_id is None:
+    key = (token, settings.secret_key, settings.algorithm)
+    now = time.time()
+    with _token_cache_lock:
+        cached = _token_cache.get(key)
+        if cached is not None:
+            if now < cached[1]:
+                return cached[0]
+            del _token_cache[key]
+    
+    payload = None
+    if settings.algorithm == "HS256":
+        payload = _decode_issued_token(token, settings.secret_key)
+    if payload is None:
+        try:
+            payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        except JWTError:
             return None
-        return user_id
-    except JWTError:
+    
+    user_id: str = payload.get("sub")
+    if user_id is None:
         return None
+    
+    valid_until = now + _TOKEN_CACHE_TTL
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        valid_until = min(valid_until, exp)
+    with _token_cache_lock:
+        _token_cache[key] = (user_id, valid_until)
+        if len(_token_cache) > _TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    return user_id
 
 
 def authenticate_user(password: str) -> bool:
@@ -86,7 +226,7 @@ def authenticate_user(password: str) -> bool:
     return verify_password(password, settings.password)
 
 
-async def get_current_user(credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)) -> str:
+async def get_current_user(token: Optional[str] = Depends(security)) -> str:
     """
     Dependency to get the current authenticated user.
     
@@ -94,7 +234,7 @@ async def get_current_user(credentials: Optional[HTTPAuthorizationCredentials] =
     When authentication is enabled, validates the JWT token.
     
     Args:
-        credentials: HTTP Bearer token credentials (optional if auth is disabled)
+        token: Bearer token from the Authorization header (optional if auth is disabled)
         
     Returns:
         str: The authenticated user identifier
@@ -107,15 +247,13 @@ async def get_current_user(credentials: Optional[HTTPAuthorizationCredentials] =
         return "user"
     
     # Auth is enabled, require valid token
-    if credentials is None:
+    if token is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Authentication required",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    token = credentials.credentials
-    
     # Verify the token
     user_id = verify_token(token)
     if user_id is None:
@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Dict, List, Union
 
 from app.config import settings
+from app.services.file_service import invalidate_search_caches
 
 
 class DirectoryService:
@@ -198,6 +199,7 @@ class DirectoryService:
         
         # Move the directory
         source_path.rename(dest_path)
+        invalidate_search_caches()
         
         return {
             "message": "Directory renamed successfully",
@@ -255,6 +257,7 @@ class DirectoryService:
         
         # Copy the directory recursively
         shutil.copytree(source_dir, dest_dir, symlinks=False)
+        invalidate_search_caches()
         
         return {
             "message": "Directory copied successfully",
@@ -300,3 +303,6 @@ class DirectoryService:
             }
         except OSError as e:
             raise ValueError(f"Cannot delete directory: {str(e)}")
+        finally:
+            # A failed rmtree may still have removed some notes
+            invalidate_search_caches()
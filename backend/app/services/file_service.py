@@ -1,29 +1,117 @@
 """File service for handling note operations."""
 
+import codecs
+import errno
+import json
+import mmap
 import os
+import re
 import shutil
 import subprocess
+import tempfile
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from stat import S_IMODE, S_ISLNK, S_ISREG
+from typing import BinaryIO, Dict, FrozenSet, Iterator, List, Optional, Tuple, Union
 
 from app.config import settings
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+# Markdown file suffixes (tuple for str.endswith)
+_MD_SUFFIXES = ('.md', '.markdown')
+
+# Extensions classified without opening the file
+_TEXT_EXTENSIONS = frozenset({
+    '.md', '.markdown', '.txt', '.json', '.yaml', '.yml', '.toml', '.rst',
+    '.py', '.js', '.ts', '.html', '.css', '.csv', '.xml', '.ini', '.sh',
+})
+_BINARY_EXTENSIONS = frozenset({
+    '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.webp', '.pdf',
+    '.zip', '.tar', '.gz', '.mp3', '.mp4', '.mov', '.exe', '.dll', '.so',
+    '.dylib',
+})
+
+# Search result cache: max entries and seconds an entry stays valid
+_SEARCH_CACHE_SIZE = 64
+_SEARCH_CACHE_TTL = 30.0
+
+# Bumped by invalidate_search_caches(); part of every search cache key, so
+# vault changes made outside a FileService (such as directory operations)
+# invalidate the results cached by every instance in the process
+_search_generation = 0
+
+# ioctl request number for cloning a file's extents (linux/fs.h)
+_FICLONE = 0x40049409
+
+# errno values meaning "this copy method isn't supported for these files"
+_COPY_UNSUPPORTED_ERRNOS = frozenset({
+    errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTTY,
+})
+
+# Bytes of serialized tree buffered before each chunk of a streamed listing
+_TREE_STREAM_CHUNK = 64 * 1024
+
+# Directories modified this recently are listed but not cached: a change in
+# the same timestamp tick (up to 2s on coarse filesystems) could leave the
+# mtime the cache is keyed on unchanged
+_TREE_CACHE_RACY_NS = 2_000_000_000
+
+# Read size once a note turns out larger than its stat said
+_NOTE_READ_CHUNK = 64 * 1024
+
+# Chunk size for incremental UTF-8 validation of memory-mapped files
+_UTF8_PROBE_CHUNK = 64 * 1024
+
+# ripgrep glob excluding known binary extensions (for --files listings,
+# which unlike content searches do not sniff for binary data)
+_RG_EXCLUDE_BINARY_GLOB = '!*.{' + ','.join(sorted(ext[1:] for ext in _BINARY_EXTENSIONS)) + '}'
+
+# Directories the fallback search never descends into: git metadata, and the
+# image store that the vault .gitignore (honoured by ripgrep) excludes
+_SEARCH_PRUNED_DIRS = frozenset({'.git', '_resources'})
+
+
+def invalidate_search_caches() -> None:
+    """Mark the search results cached by every FileService as stale."""
+    global _search_generation
+    _search_generation += 1
+
 
 class FileService:
     """Service for file operations with security validation."""
     
     def __init__(self):
         self.vault_path = settings.vault_path
+        # Resolve the vault root once; resolve() walks every path component
+        self._vault_resolved: Path = self.vault_path.resolve()
+        self._vault_resolved_str: str = str(self._vault_resolved)
+        self._vault_prefix: str = os.path.join(self._vault_resolved_str, '')
+        # Per-directory listing cache: path -> (mtime_ns, (subdir names, file names))
+        self._tree_cache: Dict[str, Tuple[int, Tuple[List[str], List[str]]]] = {}
+        # Recent search results: (phrases, limit, vault mtime_ns) -> (cached_at, results)
+        self._search_cache: OrderedDict[Tuple, Tuple[float, Dict]] = OrderedDict()
     
-    def _validate_path(self, path: str) -> Path:
+    def _validate_path(self, path: str) -> Tuple[Path, str, Optional[os.stat_result]]:
         """
         Validate that the path is safe and within the vault directory.
         
+        The symlink check already lstat()s every component, so the stat of
+        the target comes back with it and callers need no further
+        exists()/is_file() syscalls.
+        
         Args:
             path: The file path to validate
             
         Returns:
-            Path: The validated absolute path
+            Tuple[Path, str, Optional[os.stat_result]]: The validated absolute
+                path, its API form (see _to_vault_rel), and its stat result
+                (None if nothing exists there)
             
         Raises:
             ValueError: If the path is invalid or outside vault directory
@@ -32,76 +120,368 @@ class FileService:
         if path.startswith('/'):
             path = path[1:]  # Remove leading slash
         
-        # Join with vault path and resolve both paths
-        vault_resolved = self.vault_path.resolve()
-        full_path = (self.vault_path / path).resolve()
-        
-        # Check if path is within vault directory
-        try:
-            full_path.relative_to(vault_resolved)
-        except ValueError:
+        # Join with the resolved vault root and normalize lexically
+        root = self._vault_resolved_str
+        full_path = os.path.normpath(os.path.join(root, path))
+        if not self._is_within_vault(full_path):
             raise ValueError(f"Path traversal detected: {path}")
         
-        return full_path
+        # Symlinks below the vault root could point outside of it; only pay
+        # for realpath() when one is actually present on the path
+        has_symlink, stat = self._lstat_components(full_path)
+        if has_symlink:
+            full_path = os.path.realpath(full_path)
+            if not self._is_within_vault(full_path):
+                raise ValueError(f"Path traversal detected: {path}")
+            stat = self._stat_or_none(full_path)
+        
+        return Path(full_path), self._to_vault_rel(full_path), stat
+    
+    def _to_vault_rel(self, full_path: str) -> str:
+        """
+        Convert a normalized absolute path inside the vault to its API form.
+        
+        Slices off the cached vault prefix instead of going through
+        Path.relative_to().
+        
+        Args:
+            full_path: Normalized absolute path inside the vault
+            
+        Returns:
+            str: '/'-prefixed, '/'-separated path relative to the vault root
+        """
+        relative = full_path[len(self._vault_prefix):]
+        if os.sep != '/':
+            relative = relative.replace(os.sep, '/')
+        return '/' + relative
+    
+    def _is_within_vault(self, path: str) -> bool:
+        """Check whether a normalized absolute path string is inside the vault."""
+        root = self._vault_resolved_str
+        return path == root or path.startswith(self._vault_prefix)
+    
+    def _lstat_components(self, path: str) -> Tuple[bool, Optional[os.stat_result]]:
+        """
+        lstat() each component of a path below the vault root.
+        
+        The vault root itself is already resolved, so only the components
+        below it are inspected, stopping at the first symlink or at the
+        first one that doesn't exist.
+        
+        Args:
+            path: Normalized absolute path inside the vault
+            
+        Returns:
+            Tuple[bool, Optional[os.stat_result]]: Whether a symlink component
+                was found, and otherwise the stat of the path itself (None if
+                it doesn't exist)
+        """
+        if path == self._vault_resolved_str:
+            return False, self._stat_or_none(path)
+        
+        current = self._vault_resolved_str
+        stat = None
+        for part in path[len(self._vault_prefix):].split(os.sep):
+            current = os.path.join(current, part)
+            try:
+                stat = os.lstat(current)
+            except (FileNotFoundError, NotADirectoryError):
+                # Nothing below a missing component (or a file) can exist
+                return False, None
+            if S_ISLNK(stat.st_mode):
+                return True, None
+        return False, stat
     
-    def _is_markdown_extension(self, path: Path) -> bool:
-        """Check if file has a markdown extension."""
-        return path.suffix.lower() in ['.md', '.markdown']
+    def _is_markdown_extension(self, path: Union[str, Path]) -> bool:
+        """Check if file (a Path or a bare file name) has a markdown extension."""
+        name = path.name if isinstance(path, Path) else path
+        return name.lower().endswith(_MD_SUFFIXES)
     
-    def _is_binary_file(self, path: Path) -> bool:
+    def _is_binary_file(self, path: Union[str, Path], st: Optional[os.stat_result] = None) -> bool:
         """
         Check if a file is binary.
         
         Detection methods (in order of reliability):
-        1. Null byte check: Check first 512 bytes for null bytes
-        2. UTF-8 validation: Attempt to decode entire file as UTF-8
-        3. File size limit: Reject files > 10MB to prevent browser crashes
+        1. File size limit: Reject files > 10MB to prevent browser crashes
+        2. Extension check: Well-known text/binary extensions skip file reads
+        3. Null byte check: Check first 512 bytes for null bytes
+        4. UTF-8 validation: Attempt to decode entire file as UTF-8
         
         Args:
             path: The file path to check
+            st: The file's stat result, if the caller already has it
             
         Returns:
             bool: True if binary, False if text
         """
-        if not path.exists() or not path.is_file():
+        if st is None:
+            try:
+                st = os.stat(path)
+            except OSError:
+                return False
+        if not S_ISREG(st.st_mode):
             return False
         
         # Check file size (reject files > 10MB)
-        file_size = path.stat().st_size
+        file_size = st.st_size
         if file_size > 10 * 1024 * 1024:  # 10MB
             return True
         
+        # Known extensions are classified without reading the file
+        suffix = os.path.splitext(path)[1].lower()
+        if suffix in _TEXT_EXTENSIONS:
+            return False
+        if suffix in _BINARY_EXTENSIONS:
+            return True
+        
+        # Empty files are text (and cannot be memory-mapped)
+        if file_size == 0:
+            return False
+        
         try:
-            # Read first 512 bytes to check for null bytes
-            with open(path, 'rb') as f:
-                chunk = f.read(512)
-                # Check for null bytes (binary indicator)
-                if b'\x00' in chunk:
-                    return True
-            
-            # Attempt UTF-8 validation on entire file (for small files)
-            # For larger files, we've already checked the first 512 bytes
-            if file_size <= 1024 * 1024:  # 1MB - validate entire file
-                try:
-                    path.read_text(encoding='utf-8')
-                except UnicodeDecodeError:
-                    return True
-            else:
-                # For larger files, try to decode first chunk
-                try:
-                    chunk.decode('utf-8')
-                except UnicodeDecodeError:
+            # Probe the file through a read-only memory map so the page cache
+            # is scanned in place instead of being copied into bytes objects
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Check first 512 bytes for null bytes (binary indicator)
+                if mm.find(b'\x00', 0, 512) != -1:
                     return True
+                
+                # Attempt UTF-8 validation on entire file (for small files)
+                # For larger files, only decode the first chunk
+                end = file_size if file_size <= 1024 * 1024 else 512  # 1MB
+                decoder = codecs.getincrementaldecoder('utf-8')()
+                with memoryview(mm) as view:
+                    try:
+                        for offset in range(0, end, _UTF8_PROBE_CHUNK):
+                            decoder.decode(view[offset:min(offset + _UTF8_PROBE_CHUNK, end)])
+                        if end == file_size:
+                            decoder.decode(b'', final=True)
+                    except UnicodeDecodeError:
+                        return True
                     
-        except (IOError, PermissionError):
+        except (OSError, ValueError):
             # If we can't read the file, assume it's binary for safety
             return True
         
         return False
     
+    def _copy_file_data(self, src: BinaryIO, dst: BinaryIO) -> None:
+        """
+        Copy file contents with the cheapest mechanism available.
+        
+        Tries a FICLONE reflink first (O(1) on CoW filesystems such as
+        btrfs/XFS), then os.copy_file_range to keep the copy inside the
+        kernel, and finally a userspace copy.
+        
+        Args:
+            src: Source file opened for binary reading
+            dst: Destination file opened for binary writing
+        """
+        if fcntl is not None:
+            try:
+                fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+                return
+            except OSError as e:
+                if e.errno not in _COPY_UNSUPPORTED_ERRNOS:
+                    raise
+        
+        copy_file_range = getattr(os, 'copy_file_range', None)
+        if copy_file_range is not None:
+            try:
+                while copy_file_range(src.fileno(), dst.fileno(), 1 << 30):
+                    pass
+                return
+            except OSError as e:
+                if e.errno not in _COPY_UNSUPPORTED_ERRNOS:
+                    raise
+                # Restart from scratch in case a partial copy happened
+                src.seek(0)
+                dst.seek(0)
+                dst.truncate()
+        
+        shutil.copyfileobj(src, dst)
+    
+    def _atomic_write(self, path: str, content: str, durable: bool = False,
+                      exclusive: bool = False, mode: int = 0o644) -> None:
+        """
+        Write a file atomically via a temporary file in the same directory.
+        
+        The content is encoded once and written with os.write, then the
+        temporary file is moved into place so readers never see a partial
+        note, even if the process dies mid-write.
+        
+        Args:
+            path: Destination file path
+            content: Text to write as UTF-8
+            durable: fsync the data before moving it into place
+            exclusive: Fail instead of replacing an existing file
+            mode: Permission bits for the new file
+            
+        Raises:
+            FileExistsError: If exclusive is set and the file already exists
+        """
+        directory, name = os.path.split(path)
+        data = content.encode('utf-8')
+        
+        # Hidden, randomly named so the file tree never lists an in-flight
+        # write and leftovers from a crash can't block later writes
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+        try:
+            try:
+                os.fchmod(fd, mode)
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+                if durable:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+            
+            if not exclusive:
+                os.replace(tmp_path, path)
+                return
+            
+            # link() fails atomically with EEXIST, unlike rename() which overwrites
+            try:
+                os.link(tmp_path, path)
+            except FileExistsError:
+                raise
+            except OSError:
+                # Filesystem without hard link support: fall back to check + rename
+                if os.path.lexists(path):
+                    raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), path)
+                os.rename(tmp_path, path)
+        finally:
+            # Already gone after a successful replace/rename
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+    
+    def _directory_node(self, name: str, relative_path: str, stat: Optional[os.stat_result]) -> Dict:
+        """
+        Create a directory node (without children populated).
+        
+        Args:
+            name: The directory name
+            relative_path: The relative path from vault root
+            stat: The directory's stat result, or None if it couldn't be read
+            
+        Returns:
+            Dict: Directory node with an empty children list
+        """
+        return {
+            "name": name,
+            "path": '/' + relative_path,
+            "type": "directory",
+            "children": [],
+            "created": int(stat.st_ctime) if stat is not None else None,
+            "modified": int(stat.st_mtime) if stat is not None else None
+        }
+    
+    def _scan_directory(self, directory: str) -> Tuple[List[str], List[str]]:
+        """
+        List the entries of a single directory level.
+        
+        Args:
+            directory: The directory path on disk
+            
+        Returns:
+            Tuple[List[str], List[str]]: Sorted subdirectory names and sorted
+                file names (hidden entries excluded)
+        """
+        # Partition entry names into directories and files, checking each
+        # entry's type once (from the cached d_type), then sort each group
+        # with the C-level str.lower key instead of a Python lambda
+        subdirs = []
+        subfiles = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    # Skip hidden files and directories
+                    if entry.name.startswith('.'):
+                        continue
+                    if entry.is_dir():
+                        subdirs.append(entry.name)
+                    elif entry.is_file():
+                        subfiles.append(entry.name)
+        except PermissionError:
+            # Skip directories we can't read
+            return [], []
+        
+        subdirs.sort(key=str.lower)
+        subfiles.sort(key=str.lower)
+        return subdirs, subfiles
+    
+    def _list_directory(
+        self,
+        directory: str,
+        stat: Optional[os.stat_result],
+        cache: Dict[str, Tuple[int, Tuple[List[str], List[str]]]]
+    ) -> Tuple[List[str], List[str]]:
+        """
+        List a directory level, from the cache if its mtime is unchanged.
+        
+        Args:
+            directory: The directory path on disk
+            stat: The directory's stat result, or None if it couldn't be read
+            cache: Listing cache to consult
+            
+        Returns:
+            Tuple[List[str], List[str]]: Sorted subdirectory and file names
+        """
+        if stat is not None:
+            cached = cache.get(directory)
+            if cached is not None and cached[0] == stat.st_mtime_ns:
+                return cached[1]
+        return self._scan_directory(directory)
+    
+    def _file_nodes(self, directory: str, relative_path: str, names: List[str]) -> List[Dict]:
+        """
+        Build file nodes for the named files, stat-ing each one.
+        
+        Args:
+            directory: The directory path on disk
+            relative_path: The relative path from vault root
+            names: File names in the directory
+            
+        Returns:
+            List[Dict]: File nodes, skipping files removed since listing
+        """
+        # Build child paths by plain concatenation onto a per-directory
+        # prefix rather than formatting a string per entry
+        prefix = '/' + relative_path + '/' if relative_path else '/'
+        
+        file_nodes = []
+        for name in names:
+            # Add all files with timestamps (not just markdown). On POSIX
+            # DirEntry.stat() is a plain stat() call anyway, so stat-ing by
+            # path costs the same.
+            try:
+                stat = os.stat(os.path.join(directory, name))
+            except OSError:
+                # Removed since the directory was listed
+                continue
+            file_nodes.append({
+                "name": name,
+                "path": prefix + name,
+                "type": "file",
+                "created": int(stat.st_ctime),
+                "modified": int(stat.st_mtime)
+            })
+        return file_nodes
+    
     def _build_file_tree(self, directory: Path, relative_path: str = "") -> Dict:
         """
-        Build a file tree structure recursively.
+        Build a file tree structure.
+        
+        Walks the tree iteratively (breadth-first) with os.scandir rather than
+        recursing. The names in each directory are cached keyed on the
+        directory's mtime, which changes whenever an entry is added, removed
+        or renamed, so unchanged directories are not listed again. Files are
+        still stat-ed on every walk, since editing one in place leaves the
+        directory mtime alone. A directory that is its own ancestor (a
+        symlink cycle) is included without children.
         
         Args:
             directory: The directory to scan
@@ -110,56 +490,132 @@ class FileService:
         Returns:
             Dict: File tree structure
         """
-        children = []
-        
-        try:
-            # Get all items in directory, sorted by name
-            items = sorted(directory.iterdir(), key=lambda x: (x.is_file(), x.name.lower()))
+        previous_cache = self._tree_cache
+        tree_cache: Dict[str, Tuple[int, Tuple[List[str], List[str]]]] = {}
+        cacheable_before = time.time_ns() - _TREE_CACHE_RACY_NS
+        
+        root_path = str(directory)
+        root_stat = self._stat_or_none(root_path)
+        root = self._directory_node(
+            directory.name if relative_path else "vault", relative_path, root_stat
+        )
+        # Each entry carries the (st_dev, st_ino) of its ancestors
+        pending = deque([
+            (root_path, relative_path, root["children"], root_stat, self._ancestry(frozenset(), root_stat))
+        ])
+        
+        while pending:
+            current, current_relative, children, current_stat, ancestors = pending.popleft()
             
-            for item in items:
-                # Skip hidden files and directories
-                if item.name.startswith('.'):
-                    continue
-                
-                item_relative_path = f"{relative_path}/{item.name}" if relative_path else item.name
+            subdirs, subfiles = self._list_directory(current, current_stat, previous_cache)
+            if current_stat is not None and current_stat.st_mtime_ns < cacheable_before:
+                tree_cache[current] = (current_stat.st_mtime_ns, (subdirs, subfiles))
+            
+            prefix = current_relative + '/' if current_relative else ''
+            
+            for name in subdirs:
+                item_path = os.path.join(current, name)
+                item_relative_path = prefix + name
+                item_stat = self._stat_or_none(item_path)
                 
-                if item.is_dir():
-                    # Recursively build directory tree
-                    dir_tree = self._build_file_tree(item, item_relative_path)
-                    # Include all directories, even if empty
-                    children.append(dir_tree)
-                elif item.is_file():
-                    # Add all files with timestamps (not just markdown)
-                    stat = item.stat()
-                    children.append({
-                        "name": item.name,
-                        "path": f"/{item_relative_path}",
-                        "type": "file",
-                        "created": int(stat.st_ctime),
-                        "modified": int(stat.st_mtime)
-                    })
+                # Include all directories, even if empty
+                dir_node = self._directory_node(name, item_relative_path, item_stat)
+                children.append(dir_node)
+                item_ancestors = self._ancestry(ancestors, item_stat)
+                if item_ancestors is not None:
+                    pending.append((item_path, item_relative_path, dir_node["children"], item_stat, item_ancestors))
+            
+            children.extend(self._file_nodes(current, current_relative, subfiles))
         
-        except PermissionError:
-            # Skip directories we can't read
-            pass
+        # Only keep directories seen in this walk so removed ones are dropped
+        self._tree_cache = tree_cache
+        return root
+    
+    def _ancestry(
+        self,
+        ancestors: FrozenSet[Tuple[int, int]],
+        stat: Optional[os.stat_result]
+    ) -> Optional[FrozenSet[Tuple[int, int]]]:
+        """
+        Add a directory to the ancestors of the directories below it.
         
-        # Get directory timestamps
+        Args:
+            ancestors: (st_dev, st_ino) of the directories above this one
+            stat: The directory's stat result, or None if it couldn't be read
+            
+        Returns:
+            Optional[FrozenSet[Tuple[int, int]]]: The ancestors for its
+                children, or None if the directory is one of its own
+                ancestors and must not be descended into
+        """
+        if stat is None:
+            return ancestors
+        key = (stat.st_dev, stat.st_ino)
+        if key in ancestors:
+            return None
+        return ancestors | {key}
+    
+    def _iter_children(
+        self,
+        directory: str,
+        relative_path: str,
+        ancestors: FrozenSet[Tuple[int, int]]
+    ) -> Iterator[Tuple[Dict, Optional[str], Optional[FrozenSet[Tuple[int, int]]]]]:
+        """
+        Yield the child nodes of one directory, directories first.
+        
+        Unchanged directory listings are served from the tree cache (read-only;
+        only _build_file_tree replaces it).
+        
+        Args:
+            directory: The directory path on disk
+            relative_path: The relative path from vault root
+            ancestors: (st_dev, st_ino) of this directory and those above it
+            
+        Yields:
+            Tuple[Dict, Optional[str], Optional[FrozenSet]]: A node and, for
+                directory nodes to descend into, the directory's path on disk
+                and its children's ancestors (None for files, and for
+                directories that are their own ancestor). Directory nodes are
+                yielded with empty children.
+        """
+        subdirs, subfiles = self._list_directory(
+            directory, self._stat_or_none(directory), self._tree_cache
+        )
+        
+        prefix = relative_path + '/' if relative_path else ''
+        for name in subdirs:
+            item_path = os.path.join(directory, name)
+            item_stat = self._stat_or_none(item_path)
+            item_ancestors = self._ancestry(ancestors, item_stat)
+            node = self._directory_node(name, prefix + name, item_stat)
+            if item_ancestors is None:
+                yield node, None, None
+            else:
+                yield node, item_path, item_ancestors
+        for node in self._file_nodes(directory, relative_path, subfiles):
+            yield node, None, None
+    
+    def _stat_or_none(self, path: str) -> Optional[os.stat_result]:
+        """Stat a path, returning None if it can't be accessed."""
         try:
-            stat = directory.stat()
-            created = int(stat.st_ctime)
-            modified = int(stat.st_mtime)
-        except (OSError, PermissionError):
-            created = None
-            modified = None
+            return os.stat(path)
+        except OSError:
+            return None
+    
+    def _invalidate_caches(self, *paths: Union[str, Path]) -> None:
+        """
+        Drop cached data affected by a write to the given paths.
         
-        return {
-            "name": directory.name if relative_path else "vault",
-            "path": f"/{relative_path}" if relative_path else "/",
-            "type": "directory",
-            "children": children,
-            "created": created,
-            "modified": modified
-        }
+        Removes the cached tree levels for the directories containing the
+        paths and clears all cached search results.
+        
+        Args:
+            paths: Files that were created, modified, moved or deleted
+        """
+        for path in paths:
+            self._tree_cache.pop(os.path.dirname(path), None)
+        self._search_cache.clear()
     
     def list_notes(self) -> Dict:
         """
@@ -168,7 +624,62 @@ class FileService:
         Returns:
             Dict: File tree structure
         """
-        return self._build_file_tree(self.vault_path)
+        return self._build_file_tree(self._vault_resolved)
+    
+    def list_notes_stream(self) -> Iterator[bytes]:
+        """
+        Serialize the note tree as JSON incrementally.
+        
+        Produces the same document as the list_notes() response, but walks
+        the vault depth-first and emits each node as soon as it is seen, so
+        memory grows with the tree depth instead of the number of notes.
+        
+        Yields:
+            bytes: Consecutive chunks of the JSON document
+        """
+        dumps = json.dumps
+        
+        def open_directory(node: Dict) -> str:
+            return (
+                f'{{"name": {dumps(node["name"])}, "path": {dumps(node["path"])}, '
+                f'"type": "directory", "children": ['
+            )
+        
+        def close_directory(node: Dict) -> str:
+            return f'], "created": {dumps(node["created"])}, "modified": {dumps(node["modified"])}}}'
+        
+        root_path = self._vault_resolved_str
+        root_stat = self._stat_or_none(root_path)
+        root = self._directory_node("vault", "", root_stat)
+        buffer = [open_directory(root)]
+        size = 0
+        # Each frame: [children iterator, directory node, first child pending]
+        stack = [[self._iter_children(root_path, "", self._ancestry(frozenset(), root_stat)), root, True]]
+        
+        while stack:
+            frame = stack[-1]
+            item = next(frame[0], None)
+            if item is None:
+                stack.pop()
+                chunk = close_directory(frame[1])
+            else:
+                node, node_path, ancestors = item
+                chunk = '' if frame[2] else ', '
+                frame[2] = False
+                if node_path is None:
+                    chunk += dumps(node)
+                else:
+                    chunk += open_directory(node)
+                    stack.append([self._iter_children(node_path, node["path"][1:], ancestors), node, True])
+            
+            buffer.append(chunk)
+            size += len(chunk)
+            if size >= _TREE_STREAM_CHUNK:
+                yield ''.join(buffer).encode('utf-8')
+                buffer = []
+                size = 0
+        
+        yield ''.join(buffer).encode('utf-8')
     
     def get_note(self, path: str) -> Dict[str, Union[str, int]]:
         """
@@ -184,41 +695,58 @@ class FileService:
             FileNotFoundError: If note doesn't exist
             ValueError: If path is invalid
         """
-        file_path = self._validate_path(path)
+        # The stat from validation serves the existence/type checks and the metadata
+        file_path, vault_rel, stat = self._validate_path(path)
         
-        if not file_path.exists():
+        if stat is None:
             raise FileNotFoundError(f"Note not found: {path}")
         
-        if not file_path.is_file():
+        if not S_ISREG(stat.st_mode):
             raise ValueError(f"Path is not a file: {path}")
         
         # Check if file is binary
-        if self._is_binary_file(file_path):
+        if self._is_binary_file(file_path, stat):
             raise ValueError(f"Binary files cannot be opened: {path}")
         
-        # Get the normalized path (relative to vault)
-        normalized_path = file_path.relative_to(self.vault_path.resolve())
-        
         try:
-            content = file_path.read_text(encoding='utf-8')
-            stat = file_path.stat()
+            # Read with os.read and decode once, skipping the newline
+            # translation done by read_text(). The note may have been replaced
+            # or grown since validation, so metadata comes from the opened
+            # file and reading continues until EOF rather than stopping at
+            # the size it had then
+            fd = os.open(file_path, os.O_RDONLY)
+            try:
+                stat = os.fstat(fd)
+                chunks = []
+                chunk_size = stat.st_size + 1
+                while True:
+                    chunk = os.read(fd, chunk_size)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                    chunk_size = _NOTE_READ_CHUNK
+            finally:
+                os.close(fd)
+            data = b''.join(chunks)
+            content = data.decode('utf-8')
             
             return {
                 "content": content,
-                "path": f"/{normalized_path}",
-                "size": stat.st_size,
+                "path": vault_rel,
+                "size": len(data),
                 "modified": int(stat.st_mtime)
             }
         except UnicodeDecodeError:
             raise ValueError(f"File contains invalid UTF-8 content: {path}")
     
-    def create_note(self, path: str, content: str = "") -> Dict[str, str]:
+    def create_note(self, path: str, content: str = "", durable: bool = False) -> Dict[str, str]:
         """
         Create a new note.
         
         Args:
             path: The note path
             content: The note content
+            durable: fsync the note before it becomes visible
             
         Returns:
             Dict: Success message and path
@@ -226,32 +754,34 @@ class FileService:
         Raises:
             ValueError: If path is invalid or file already exists
         """
-        file_path = self._validate_path(path)
-        
-        if file_path.exists():
-            raise ValueError(f"File already exists: {path}")
+        file_path, vault_rel, _ = self._validate_path(path)
         
         # Create parent directories if they don't exist
         file_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Write the file (allow any extension or no extension)
-        file_path.write_text(content, encoding='utf-8')
+        # Write the file (allow any extension or no extension).
+        # The exclusive atomic write creates the file or fails,
+        # so no separate exists() check is needed.
+        try:
+            self._atomic_write(str(file_path), content, durable=durable, exclusive=True)
+        except FileExistsError:
+            raise ValueError(f"File already exists: {path}")
         
-        # Get the normalized path (relative to vault)
-        normalized_path = file_path.relative_to(self.vault_path.resolve())
+        self._invalidate_caches(file_path)
         
         return {
             "message": "Note created successfully",
-            "path": f"/{normalized_path}"
+            "path": vault_rel
         }
     
-    def update_note(self, path: str, content: str) -> Dict[str, str]:
+    def update_note(self, path: str, content: str, durable: bool = False) -> Dict[str, str]:
         """
         Update an existing note.
         
         Args:
             path: The note path
             content: The new content
+            durable: fsync the new content before it replaces the note
             
         Returns:
             Dict: Success message and path
@@ -260,27 +790,27 @@ class FileService:
             FileNotFoundError: If note doesn't exist
             ValueError: If path is invalid
         """
-        file_path = self._validate_path(path)
+        file_path, vault_rel, st = self._validate_path(path)
         
-        if not file_path.exists():
+        if st is None:
             raise FileNotFoundError(f"Note not found: {path}")
         
-        if not file_path.is_file():
+        if not S_ISREG(st.st_mode):
             raise ValueError(f"Path is not a file: {path}")
         
         # Check if file is binary before writing
-        if self._is_binary_file(file_path):
+        if self._is_binary_file(file_path, st):
             raise ValueError(f"Cannot update binary file: {path}")
         
-        # Write the updated content
-        file_path.write_text(content, encoding='utf-8')
+        # Replace the note atomically, keeping its permissions
+        self._atomic_write(str(file_path), content, durable=durable, mode=S_IMODE(st.st_mode))
         
-        # Get the normalized path (relative to vault)
-        normalized_path = file_path.relative_to(self.vault_path.resolve())
+        # The file's mtime changed but its directory's did not
+        self._invalidate_caches(file_path)
         
         return {
             "message": "Note updated successfully",
-            "path": f"/{normalized_path}"
+            "path": vault_rel
         }
     
     def delete_note(self, path: str) -> Dict[str, str]:
@@ -297,23 +827,22 @@ class FileService:
             FileNotFoundError: If note doesn't exist
             ValueError: If path is invalid
         """
-        file_path = self._validate_path(path)
+        file_path, vault_rel, st = self._validate_path(path)
         
-        if not file_path.exists():
+        if st is None:
             raise FileNotFoundError(f"Note not found: {path}")
         
-        if not file_path.is_file():
+        if not S_ISREG(st.st_mode):
             raise ValueError(f"Path is not a file: {path}")
         
-        # Get the normalized path before deleting (relative to vault)
-        normalized_path = file_path.relative_to(self.vault_path.resolve())
-        
         # Delete the file
-        file_path.unlink()
+        os.unlink(file_path)
+        
+        self._invalidate_caches(file_path)
         
         return {
             "message": "Note deleted successfully",
-            "path": f"/{normalized_path}"
+            "path": vault_rel
         }
     
     def rename_note(self, old_path: str, new_path: str) -> Dict[str, str]:
@@ -331,30 +860,39 @@ class FileService:
             FileNotFoundError: If source note doesn't exist
             ValueError: If paths are invalid or destination already exists
         """
-        source_path = self._validate_path(old_path)
-        dest_path = self._validate_path(new_path)
+        source_path, _, st = self._validate_path(old_path)
+        dest_path, vault_rel, _ = self._validate_path(new_path)
+        src = str(source_path)
+        dst = str(dest_path)
         
-        if not source_path.exists():
+        if st is None:
             raise FileNotFoundError(f"Note not found: {old_path}")
         
-        if not source_path.is_file():
+        if not S_ISREG(st.st_mode):
             raise ValueError(f"Source path is not a file: {old_path}")
         
-        if dest_path.exists():
-            raise ValueError(f"Destination already exists: {new_path}")
-        
         # Create parent directories if they don't exist
-        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
         
-        # Move the file
-        source_path.rename(dest_path)
+        # Move the file without replacing an existing destination.
+        # link() fails atomically with EEXIST, unlike rename() which overwrites.
+        try:
+            os.link(src, dst)
+        except FileExistsError:
+            raise ValueError(f"Destination already exists: {new_path}")
+        except OSError:
+            # Filesystem without hard link support: fall back to check + rename
+            if os.path.lexists(dst):
+                raise ValueError(f"Destination already exists: {new_path}")
+            os.rename(src, dst)
+        else:
+            os.unlink(src)
         
-        # Get the normalized path (relative to vault)
-        normalized_path = dest_path.relative_to(self.vault_path.resolve())
+        self._invalidate_caches(src, dst)
         
         return {
             "message": "Note renamed successfully",
-            "path": f"/{normalized_path}"
+            "path": vault_rel
         }
     
     def move_note(self, source_path: str, dest_path: str) -> Dict[str, str]:
@@ -385,30 +923,31 @@ class FileService:
             FileNotFoundError: If source note doesn't exist
             ValueError: If paths are invalid or destination already exists
         """
-        source_file = self._validate_path(source_path)
-        dest_file = self._validate_path(dest_path)
+        source_file, _, st = self._validate_path(source_path)
+        dest_file, vault_rel, _ = self._validate_path(dest_path)
         
-        if not source_file.exists():
+        if st is None:
             raise FileNotFoundError(f"Note not found: {source_path}")
         
-        if not source_file.is_file():
+        if not S_ISREG(st.st_mode):
             raise ValueError(f"Source path is not a file: {source_path}")
         
-        if dest_file.exists():
-            raise ValueError(f"Destination already exists: {dest_path}")
-        
         # Create parent directories if they don't exist
         dest_file.parent.mkdir(parents=True, exist_ok=True)
         
-        # Copy the file (preserving metadata)
-        shutil.copy2(source_file, dest_file)
+        # Copy the file data in-kernel, then preserve metadata
+        try:
+            with open(source_file, 'rb') as src, open(dest_file, 'xb') as dst:
+                self._copy_file_data(src, dst)
+        except FileExistsError:
+            raise ValueError(f"Destination already exists: {dest_path}")
+        shutil.copystat(source_file, dest_file)
         
-        # Get the normalized path (relative to vault)
-        normalized_path = dest_file.relative_to(self.vault_path.resolve())
+        self._invalidate_caches(dest_file)
         
         return {
             "message": "Note copied successfully",
-            "path": f"/{normalized_path}"
+            "path": vault_rel
         }
     
     def search_notes(self, query: str, limit: int = 50) -> Dict[str, Union[List[Dict], int]]:
@@ -434,30 +973,42 @@ class FileService:
         if not phrases:
             return {"results": [], "total": 0}
         
+        # Serve repeated queries from the cache. Search is case-insensitive
+        # and phrase order doesn't matter, so both are normalized in the key.
+        # The vault root mtime catches top-level changes, writes through this
+        # service clear the cache, the search generation catches directory
+        # operations, and the TTL bounds staleness from edits made outside
+        # the app.
+        try:
+            root_mtime = os.stat(self._vault_resolved_str).st_mtime_ns
+        except OSError:
+            root_mtime = None
+        cache_key = (
+            tuple(sorted({p.lower() for p in phrases})), limit, root_mtime, _search_generation
+        )
+        cached = self._search_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < _SEARCH_CACHE_TTL:
+            self._search_cache.move_to_end(cache_key)
+            return cached[1]
+        
         # Find files matching all phrases using ripgrep
         matching_files_with_snippets = self._search_with_ripgrep(phrases)
         
         # Build result structure with modified timestamps
         results = []
-        for file_path, snippets in matching_files_with_snippets.items():
-            # Get relative path from vault root
+        for vault_rel, snippets in matching_files_with_snippets.items():
+            # Get file stats for modified time
             try:
-                rel_path = file_path.relative_to(self.vault_path.resolve())
-                
-                # Get file stats for modified time
+                modified = int(os.stat(self._vault_resolved_str + vault_rel).st_mtime)
+            except OSError:
                 modified = None
-                if file_path.exists():
-                    modified = int(file_path.stat().st_mtime)
-                
-                results.append({
-                    "path": f"/{rel_path}",
-                    "name": file_path.name,
-                    "snippets": snippets,
-                    "modified": modified
-                })
-            except ValueError:
-                # Skip files outside vault (shouldn't happen due to validation)
-                continue
+            
+            results.append({
+                "path": vault_rel,
+                "name": vault_rel.rpartition('/')[2],
+                "snippets": snippets,
+                "modified": modified
+            })
         
         # Sort by modified time (most recent first)
         results.sort(key=lambda x: x.get("modified", 0), reverse=True)
@@ -465,94 +1016,98 @@ class FileService:
         # Limit results after sorting
         results = results[:limit]
         
-        return {
+        response = {
             "results": results,
             "total": len(results)
         }
+        
+        self._search_cache[cache_key] = (time.monotonic(), response)
+        if len(self._search_cache) > _SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
+        
+        return response
     
-    def _search_with_ripgrep(self, phrases: List[str]) -> Dict[Path, List[Dict[str, Union[int, str]]]]:
+    def _run_ripgrep(self, args: List[str]) -> str:
+        """
+        Run ripgrep over the vault (excluding .git) and return its output.
+        
+        Args:
+            args: ripgrep arguments (options and -e patterns)
+            
+        Returns:
+            str: Decoded stdout, or an empty string if nothing matched
+            
+        Raises:
+            FileNotFoundError: If ripgrep is not installed
+            subprocess.TimeoutExpired: If ripgrep takes too long
+        """
+        result = subprocess.run(
+            [
+                'rg',
+                '--no-config',  # ignore user RIPGREP_CONFIG_PATH settings
+                '--no-messages',  # suppress per-file error messages
+                '--glob', '!**/.git/**',  # ignore .git recursively
+                *args,
+                '.'  # Explicitly search current directory
+            ],
+            cwd=self._vault_resolved_str,
+            capture_output=True,
+            timeout=5
+        )
+        
+        # Exit code 1 means no matches; 2 means an error occurred
+        if result.returncode != 0:
+            return ""
+        return result.stdout.decode('utf-8', errors='replace')
+    
+    def _search_with_ripgrep(self, phrases: List[str]) -> Dict[str, List[Dict[str, Union[int, str]]]]:
         """
         Use ripgrep to find files matching all phrases with snippets.
         
         A file matches if all phrases are found somewhere in the file content or filename.
         Returns up to 3 matching lines per file with line numbers.
         
+        Phrases are matched as literal strings. Each per-phrase search emits
+        JSON match records, so snippets are collected in the same pass that
+        decides which files match; together with a single ``rg --files``
+        listing for the filename check, a query of N phrases runs N + 1
+        ripgrep processes. They are independent, so they run concurrently
+        and the search takes as long as the slowest one.
+        
         Args:
             phrases: List of search phrases (all must match)
             
         Returns:
-            Dict: Mapping of file paths to list of snippets (line_number, content)
+            Dict: Mapping of file paths in API form (see _to_vault_rel) to
+                list of snippets (line_number, content)
         """
-        # First pass: Find files matching all phrases
+        try:
+            # Threads only wait on subprocesses, which releases the GIL
+            workers = min(len(phrases) + 1, os.cpu_count() or 4)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                listing = executor.submit(self._rg_list_files)
+                content_matches = list(executor.map(self._rg_content_matches, phrases))
+                listed_files = listing.result()
+        except FileNotFoundError:
+            # ripgrep not installed, fall back to basic search
+            return self._fallback_search(phrases)
+        
         all_matches = None
+        snippets_per_file: Dict[str, Dict[int, str]] = {}
         
-        for phrase in phrases:
+        for phrase, file_snippets in zip(phrases, content_matches):
             # Search for this phrase in file contents AND filenames
-            phrase_matches = set()
+            phrase_matches = set(file_snippets)
+            for rel_path, lines in file_snippets.items():
+                snippets_per_file.setdefault(rel_path, {}).update(lines)
             
-            try:
-                # Search file contents with ripgrep (case-insensitive)
-                # Search all files, not just markdown
-                result = subprocess.run(
-                    [
-                        'rg',
-                        '-i',  # case insensitive
-                        '-l',  # list files only
-                        '--glob', '!**/.git/**',  # ignore .git recursively
-                        phrase,
-                        '.'  # Explicitly search current directory
-                    ],
-                    cwd=str(self.vault_path),
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                
-                # Parse ripgrep output (one filename per line)
-                # Filter out binary files
-                if result.returncode == 0 and result.stdout.strip():
-                    for line in result.stdout.strip().split('\n'):
-                        if line:
-                            file_path = (self.vault_path / line.strip()).resolve()
-                            if file_path.exists() and file_path.is_file():
-                                # Skip binary files
-                                if not self._is_binary_file(file_path):
-                                    phrase_matches.add(file_path)
-                
-                # Also search filenames using ripgrep --files with case-insensitive glob
-                # This is much faster than Python's rglob
-                # Use --iglob for case-insensitive filename matching
-                # Search all files, not just markdown
-                files_result = subprocess.run(
-                    [
-                        'rg',
-                        '--files',
-                        '--iglob', f'*{phrase}*',  # case-insensitive glob for filename matching
-                        '--glob', '!**/.git/**',  # ignore .git recursively
-                        '.'  # Explicitly search current directory
-                    ],
-                    cwd=str(self.vault_path),
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                
-                # Add matching files (filter out binary files)
-                if files_result.returncode == 0 and files_result.stdout.strip():
-                    for line in files_result.stdout.strip().split('\n'):
-                        if line:
-                            file_path = (self.vault_path / line.strip()).resolve()
-                            if file_path.exists() and file_path.is_file():
-                                # Skip binary files
-                                if not self._is_binary_file(file_path):
-                                    phrase_matches.add(file_path)
-            
-            except subprocess.TimeoutExpired:
-                # If ripgrep times out, continue with what we have
-                pass
-            except FileNotFoundError:
-                # ripgrep not installed, fall back to basic search
-                phrase_matches = self._fallback_search_files(phrase)
+            # Case-insensitive filename match; only unknown extensions
+            # still need the binary sniff
+            phrase_lower = phrase.lower()
+            for rel_path in listed_files:
+                if phrase_lower in rel_path.rpartition('/')[2].lower():
+                    if not self._is_binary_file(self._vault_resolved_str + rel_path):
+                        phrase_matches.add(rel_path)
             
             # Intersect with previous matches (all phrases must match)
             if all_matches is None:
@@ -562,79 +1117,161 @@ class FileService:
             
             # Early exit if no matches
             if not all_matches:
-                break
+                return {}
         
-        if not all_matches:
-            return {}
+        # Merge the per-phrase snippets of each surviving file in line order.
+        # Files matched only by name have no content match for any phrase,
+        # so they get an empty list without another ripgrep pass.
+        results_with_snippets = {}
+        for rel_path in all_matches:
+            lines = snippets_per_file.get(rel_path, {})
+            results_with_snippets[rel_path] = [
+                {"line_number": line_number, "content": lines[line_number]}
+                for line_number in sorted(lines)[:3]
+            ]
         
-        # Second pass: Get snippets for matching files
-        # Combine all phrases into a single regex pattern (OR operation)
-        combined_pattern = '|'.join(phrases)
+        return results_with_snippets
+    
+    def _rg_list_files(self) -> List[str]:
+        """
+        List searchable files for filename matching.
         
-        results_with_snippets = {}
+        ``--files`` does not inspect contents, so known binary extensions
+        are excluded by glob instead.
         
-        try:
-            # Search with line numbers and get matching content
-            # Search all files, not just markdown
-            result = subprocess.run(
-                [
-                    'rg',
-                    '-i',  # case insensitive
-                    '-n',  # show line numbers
-                    '--max-count', '3',  # limit to first 3 matches per file
-                    '--glob', '!**/.git/**',  # ignore .git recursively
-                    combined_pattern,
-                    '.'  # Explicitly search current directory
-                ],
-                cwd=str(self.vault_path),
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+        Returns:
+            List[str]: File paths in API form (see _to_vault_rel)
             
-            # Parse ripgrep output: "filename:line_number:content"
-            if result.returncode == 0 and result.stdout.strip():
-                for line in result.stdout.strip().split('\n'):
-                    if ':' in line:
-                        parts = line.split(':', 2)
-                        if len(parts) >= 3:
-                            filename = parts[0]
-                            line_number = parts[1]
-                            content = parts[2]
-                            
-                            file_path = (self.vault_path / filename).resolve()
-                            
-                            # Only include files that matched all phrases and are not binary
-                            if file_path in all_matches and not self._is_binary_file(file_path):
-                                if file_path not in results_with_snippets:
-                                    results_with_snippets[file_path] = []
-                                
-                                # Add snippet if we haven't reached the limit
-                                if len(results_with_snippets[file_path]) < 3:
-                                    try:
-                                        results_with_snippets[file_path].append({
-                                            "line_number": int(line_number),
-                                            "content": content.strip()
-                                        })
-                                    except ValueError:
-                                        # Skip if line_number is not an integer
-                                        continue
+        Raises:
+            FileNotFoundError: If ripgrep is not installed
+        """
+        try:
+            output = self._run_ripgrep([
+                '--files',
+                '--iglob', _RG_EXCLUDE_BINARY_GLOB,  # skip known binary extensions
+                '--max-filesize', '10M',  # larger files are treated as binary
+            ])
+        except subprocess.TimeoutExpired:
+            return []
+        return [self._rg_vault_rel(line) for line in output.splitlines()]
+    
+    def _rg_content_matches(self, phrase: str) -> Dict[str, Dict[int, str]]:
+        """
+        Find files whose content contains a phrase, with their first matching lines.
+        
+        ripgrep skips binary files (null bytes) itself during recursive
+        search, so results need no re-check in Python.
         
+        Args:
+            phrase: Search phrase, matched literally and case-insensitively
+            
+        Returns:
+            Dict: Vault-relative file paths mapped to {line_number: content}
+                for up to 3 matching lines
+            
+        Raises:
+            FileNotFoundError: If ripgrep is not installed
+        """
+        try:
+            output = self._run_ripgrep([
+                '-i',  # case insensitive
+                '-F',  # literal phrase, not a regex
+                '--json',  # typed NDJSON records with paths and lines
+                '--max-count', '3',  # first 3 matching lines per file
+                '--max-filesize', '10M',  # larger files are treated as binary
+                '-e', phrase,
+            ])
         except subprocess.TimeoutExpired:
             # If ripgrep times out, continue with what we have
-            pass
-        except FileNotFoundError:
-            # ripgrep not installed, fall back to basic search
-            results_with_snippets = self._fallback_search_with_snippets(all_matches, phrases)
+            return {}
         
-        # Add files without content matches (filename matches only)
-        for file_path in all_matches:
-            if file_path not in results_with_snippets:
-                results_with_snippets[file_path] = []
+        # Only "match" records carry snippets. Paths and lines that aren't
+        # valid UTF-8 come back base64-encoded under "bytes" instead of
+        # "text" and are skipped.
+        matches: Dict[str, Dict[int, str]] = {}
+        for raw in output.splitlines():
+            record = json.loads(raw)
+            if record['type'] != 'match':
+                continue
+            data = record['data']
+            filename = data['path'].get('text')
+            content = data['lines'].get('text')
+            if filename is None or content is None:
+                continue
+            
+            # ripgrep only reports files it just read, so the path needs
+            # no existence check
+            rel_path = self._rg_vault_rel(filename)
+            matches.setdefault(rel_path, {})[data['line_number']] = content.strip()
+        return matches
+    
+    def _rg_vault_rel(self, path: str) -> str:
+        """Convert a path printed by ripgrep (searching '.') to its API form."""
+        if path.startswith('.' + os.sep):
+            path = path[1:]
+        else:
+            path = os.sep + path
+        return path if os.sep == '/' else path.replace(os.sep, '/')
+    
+    def _fallback_search(self, phrases: List[str]) -> Dict[str, List[Dict[str, Union[int, str]]]]:
+        """
+        Fallback for _search_with_ripgrep when ripgrep is not available.
         
-        return results_with_snippets
+        Args:
+            phrases: List of search phrases (all must match)
+            
+        Returns:
+            Dict: Mapping of file paths in API form (see _to_vault_rel) to
+                list of snippets (line_number, content)
+        """
+        all_matches = None
+        for phrase in phrases:
+            phrase_matches = self._fallback_search_files(phrase)
+            all_matches = phrase_matches if all_matches is None else all_matches & phrase_matches
+            if not all_matches:
+                return {}
+        
+        snippets = self._fallback_search_with_snippets(all_matches, phrases)
+        return {
+            self._to_vault_rel(file_path): file_snippets
+            for file_path, file_snippets in snippets.items()
+        }
     
-    def _fallback_search_files(self, phrase: str) -> set[Path]:
+    def _iter_text_files(self) -> Iterator[Tuple[str, str]]:
+        """
+        Yield every searchable text file in the vault.
+        
+        Walks with os.scandir and an explicit stack, keeping paths as plain
+        strings: directory entries are classified from readdir without a
+        stat, and each file's single stat is reused by the binary check.
+        Like ripgrep, symlinked directories are not followed.
+        
+        Yields:
+            Tuple[str, str]: Absolute path and name of each text file
+        """
+        stack = [self._vault_resolved_str]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir():
+                                # Prune skipped directories before descending
+                                if not entry.is_symlink() and entry.name not in _SEARCH_PRUNED_DIRS:
+                                    stack.append(entry.path)
+                                continue
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        
+                        # Skip anything that isn't a regular file (e.g. broken
+                        # links) and binary files
+                        if S_ISREG(st.st_mode) and not self._is_binary_file(entry.path, st):
+                            yield entry.path, entry.name
+            except OSError:
+                continue
+    
+    def _fallback_search_files(self, phrase: str) -> set[str]:
         """
         Fallback search method when ripgrep is not available - returns only file paths.
         
@@ -642,35 +1279,30 @@ class FileService:
             phrase: Search phrase
             
         Returns:
-            set: Set of matching file paths
+            set: Set of matching absolute file path strings
         """
         matches = set()
         phrase_lower = phrase.lower()
+        pattern = self._compile_search_pattern([phrase])
         
         # Search all files (not just markdown)
-        for file_path in self.vault_path.rglob('*'):
-            # Skip directories
-            if not file_path.is_file():
-                continue
-            
-            # Skip .git directories
-            if '.git' in file_path.parts:
-                continue
-            
-            # Skip binary files
-            if self._is_binary_file(file_path):
-                continue
-            
+        for file_path, name in self._iter_text_files():
             try:
                 # Check filename
-                if phrase_lower in file_path.name.lower():
+                if phrase_lower in name.lower():
                     matches.add(file_path)
                     continue
                 
-                # Check content
-                content = file_path.read_text(encoding='utf-8').lower()
-                if phrase_lower in content:
-                    matches.add(file_path)
+                # Check content; ASCII phrases are matched on the raw
+                # bytes of a read-only mapping without decoding the file
+                if isinstance(pattern.pattern, bytes):
+                    if self._mapped_search(file_path, pattern) is not None:
+                        matches.add(file_path)
+                    continue
+                
+                with open(file_path, encoding='utf-8') as f:
+                    if pattern.search(f.read()):
+                        matches.add(file_path)
             except (UnicodeDecodeError, PermissionError):
                 # Skip files we can't read
                 continue
@@ -679,9 +1311,9 @@ class FileService:
     
     def _fallback_search_with_snippets(
         self, 
-        file_paths: set[Path], 
+        file_paths: set[str], 
         phrases: List[str]
-    ) -> Dict[Path, List[Dict[str, Union[int, str]]]]:
+    ) -> Dict[str, List[Dict[str, Union[int, str]]]]:
         """
         Fallback method to extract snippets when ripgrep is not available.
         
@@ -693,7 +1325,8 @@ class FileService:
             Dict: Mapping of file paths to list of snippets
         """
         results = {}
-        combined_pattern = '|'.join([p.lower() for p in phrases])
+        # One alternation of all phrases, compiled once for the whole search
+        pattern = self._compile_search_pattern(phrases)
         
         for file_path in file_paths:
             # Skip binary files
@@ -701,21 +1334,28 @@ class FileService:
                 results[file_path] = []
                 continue
             
+            if isinstance(pattern.pattern, bytes):
+                try:
+                    results[file_path] = self._mapped_snippets(file_path, pattern)
+                except (UnicodeDecodeError, PermissionError):
+                    results[file_path] = []
+                continue
+            
             snippets = []
             try:
-                # Read file and search for matches
-                lines = file_path.read_text(encoding='utf-8').split('\n')
-                for line_num, line_content in enumerate(lines, start=1):
-                    line_lower = line_content.lower()
-                    # Check if any phrase matches
-                    if any(phrase.lower() in line_lower for phrase in phrases):
-                        snippets.append({
-                            "line_number": line_num,
-                            "content": line_content.strip()
-                        })
-                        # Limit to 3 matches
-                        if len(snippets) >= 3:
-                            break
+                # Stream lines instead of building a list of the whole file;
+                # binary mode splits on '\n' only, like the mapped path
+                with open(file_path, 'rb') as f:
+                    for line_num, raw_line in enumerate(f, start=1):
+                        line_content = raw_line.decode('utf-8')
+                        if pattern.search(line_content):
+                            snippets.append({
+                                "line_number": line_num,
+                                "content": line_content.strip()
+                            })
+                            # Limit to 3 matches
+                            if len(snippets) >= 3:
+                                break
             except (UnicodeDecodeError, PermissionError):
                 # Skip files we can't read
                 results[file_path] = []
@@ -724,3 +1364,82 @@ class FileService:
             results[file_path] = snippets
         
         return results
+    
+    def _compile_search_pattern(self, phrases: List[str]) -> 're.Pattern':
+        """
+        Compile phrases into one case-insensitive literal alternation.
+        
+        ASCII-only phrases compile to a bytes pattern that can run on raw
+        file data. Bytes patterns only fold ASCII case, so any non-ASCII
+        phrase yields a str pattern for matching decoded text instead.
+        
+        Args:
+            phrases: Search phrases (any may match)
+            
+        Returns:
+            re.Pattern: Compiled bytes or str pattern
+        """
+        if all(phrase.isascii() for phrase in phrases):
+            return re.compile(b'|'.join(re.escape(phrase.encode()) for phrase in phrases), re.IGNORECASE)
+        return re.compile('|'.join(re.escape(phrase) for phrase in phrases), re.IGNORECASE)
+    
+    def _mapped_search(self, file_path: str, pattern: 're.Pattern[bytes]') -> Optional['re.Match[bytes]']:
+        """
+        Search a file's bytes through a read-only memory map.
+        
+        Args:
+            file_path: File to search
+            pattern: Compiled bytes pattern
+            
+        Returns:
+            Optional[re.Match]: First match, or None (always None for empty files)
+        """
+        with open(file_path, 'rb') as f:
+            # mmap cannot map a zero-length file
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return pattern.search(mm)
+    
+    def _mapped_snippets(self, file_path: str, pattern: 're.Pattern[bytes]') -> List[Dict[str, Union[int, str]]]:
+        """
+        Extract up to 3 matching lines from a file through a read-only memory map.
+        
+        Line numbers are recovered by counting newlines between matches, and
+        only the matching lines are decoded.
+        
+        Args:
+            file_path: File to search
+            pattern: Compiled bytes pattern
+            
+        Returns:
+            List: Snippets (line_number, content) in line order
+        """
+        snippets = []
+        with open(file_path, 'rb') as f:
+            # mmap cannot map a zero-length file
+            if os.fstat(f.fileno()).st_size == 0:
+                return snippets
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                line_num = 1
+                counted = 0
+                pos = 0
+                while len(snippets) < 3:
+                    match = pattern.search(mm, pos)
+                    if match is None:
+                        break
+                    start = match.start()
+                    # mmap.count() is 3.13+; slicing copies only the gap
+                    line_num += mm[counted:start].count(b'\n')
+                    line_start = mm.rfind(b'\n', 0, start) + 1
+                    line_end = mm.find(b'\n', start)
+                    if line_end == -1:
+                        line_end = len(mm)
+                    snippets.append({
+                        "line_number": line_num,
+                        "content": mm[line_start:line_end].decode('utf-8').strip()
+                    })
+                    # Continue after this line so it is reported only once
+                    counted = start
+                    pos = line_end + 1
+        return snippets
@@ -1,15 +1,101 @@
 """Git service for automatic version control of the vault."""
 
 import logging
+import os
+import shutil
 import subprocess
+import tempfile
+import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from stat import S_ISREG
+from typing import Any, BinaryIO, Dict, List, Optional, Set, Tuple, Union
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Bytes inspected when sniffing for binary content (git uses the same window)
+_BINARY_PROBE_SIZE = 8192
+
+# UTF-8, UTF-16 LE and UTF-16 BE byte order marks
+_UNICODE_BOMS = (b'\xef\xbb\xbf', b'\xff\xfe', b'\xfe\xff')
+
+# Leading bytes of common binary formats: PNG, ZIP (docx, xlsx, ...), PDF,
+# JPEG, GIF and gzip. PDF headers in particular are often NUL-free text
+_BINARY_MAGICS = (b'\x89PNG', b'PK\x03\x04', b'%PDF', b'\xff\xd8\xff', b'GIF8', b'\x1f\x8b')
+
+# Absolute path of git, looked up once per process; children exec it
+# directly instead of trying each PATH entry. None means git is unavailable
+_GIT_EXECUTABLE = shutil.which('git')
+
+# Config applied to every git call: no automatic gc on the request path
+# (collect_garbage runs it in the background), the untracked cache for
+# faster status, and no fsmonitor hook. Passed as -c options rather than
+# GIT_CONFIG_* variables, which git before 2.31 silently ignores
+_GIT_CONFIG = (
+    ('gc.auto', '0'),
+    ('core.untrackedCache', 'true'),
+    ('core.fsmonitor', 'false'),
+)
+_GIT_CONFIG_ARGS = tuple(arg for key, value in _GIT_CONFIG for arg in ('-c', f'{key}={value}'))
+
+# git's default loose-object threshold, restored for explicit collections
+_GC_AUTO_THRESHOLD = 6700
+
+# Binary/text verdicts remembered per service, keyed on (path, mtime, size)
+_BINARY_CACHE_SIZE = 50000
+
+# Contents of the .gitignore kept in the vault
+_GITIGNORE_BYTES = b"""# Binary files (common extensions)
+*.png
+*.jpg
+*.jpeg
+*.gif
+*.bmp
+*.ico
+*.svg
+*.webp
+*.pdf
+*.zip
+*.tar
+*.gz
+*.exe
+*.dll
+*.so
+*.dylib
+
+# Resources directory
+_resources/
+
+# Git directory
+.git/
+
+# Temporary files from interrupted atomic writes
+.*.tmp
+"""
+
+# Seconds a streamed `git log` may run before it is killed
+_GIT_LOG_TIMEOUT = 30
+
+# History lookups remembered per service (keyed on HEAD, so commits made by
+# any process invalidate them)
+_HISTORY_CACHE_SIZE = 1024
+
+# Results of git environment probes, shared by every GitService in the
+# process so `git config` runs once rather than per instance
+_git_env_lock = threading.Lock()
+_safe_directories_configured: Set[str] = set()
+_git_user_configured = False
+# Vaults already known to hold a repository, so later GitService instances
+# skip initialization entirely
+_initialized_vaults: Set[str] = set()
+
+# Held by whichever thread is staging/committing, so GitService instances in
+# the process never race each other for .git/index.lock
+_git_write_lock = threading.Lock()
+
 
 class GitService:
     """Service for managing git version control in the vault."""
@@ -22,33 +108,110 @@ class GitService:
         self._last_error: Optional[str] = None
         self._last_error_time: Optional[float] = None
         self._initialized = False
+        # Long-running `git cat-file --batch` serving historical blobs
+        self._cat_file_proc: Optional[subprocess.Popen] = None
+        self._cat_file_lock = threading.Lock()
+        self._history_cache: OrderedDict[Tuple, Any] = OrderedDict()
+        self._history_lock = threading.Lock()
+        self._binary_cache: OrderedDict[Tuple[str, int, int], bool] = OrderedDict()
+        # (mtime_ns, size) of the .gitignore last known to be current
+        self._gitignore_signature: Optional[Tuple[int, int]] = None
+        # Environment shared by every git call: no optional index locks,
+        # no credential prompts, C locale, no system-wide config
+        self._git_env = {
+            **os.environ,
+            'GIT_OPTIONAL_LOCKS': '0',
+            'GIT_TERMINAL_PROMPT': '0',
+            'LC_ALL': 'C',
+            'GIT_CONFIG_NOSYSTEM': '1',
+        }
+    
+    @property
+    def vault_path(self) -> Path:
+        """The vault directory under version control."""
+        return self._vault_path
+    
+    @vault_path.setter
+    def vault_path(self, value: Path) -> None:
+        # Resolve once here rather than on every git call; the string form
+        # is the cwd of every git subprocess
+        self._vault_path = value
+        self._resolved_vault = value.resolve()
+        self._vault_cwd = str(self._resolved_vault)
+        self._git_dir = os.path.join(self._vault_cwd, '.git')
+    
+    def _run_git(
+        self,
+        args: List[str],
+        timeout: float = 10,
+        in_vault: bool = True
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a git command with the shared environment and capture its output.
+        
+        Args:
+            args: Arguments following `git`
+            timeout: Seconds before the command is abandoned
+            in_vault: Run from the vault directory; global config and probe
+                calls pass False so they work before the vault exists
+            
+        Returns:
+            subprocess.CompletedProcess: The finished command with text output
+        """
+        # No preexec_fn or session changes, so CPython can start git with
+        # vfork rather than copying the page tables of a large worker
+        return subprocess.run(
+            ['git', *_GIT_CONFIG_ARGS, *args],
+            executable=_GIT_EXECUTABLE,
+            cwd=self._vault_cwd if in_vault else None,
+            env=self._git_env,
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+    
+    def _popen_git(self, args: List[str], stderr: BinaryIO) -> subprocess.Popen:
+        """
+        Start a git command in the vault whose text output is read as it arrives.
+        
+        Args:
+            args: Arguments following `git`
+            stderr: File receiving git's error output; a file rather than a
+                pipe, so warnings can't fill a buffer nobody is reading
+            
+        Returns:
+            subprocess.Popen: The running command, to be used as a context manager
+        """
+        return subprocess.Popen(
+            ['git', *_GIT_CONFIG_ARGS, *args],
+            executable=_GIT_EXECUTABLE,
+            cwd=self._vault_cwd,
+            env=self._git_env,
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+            text=True
+        )
     
     def _is_git_available(self) -> bool:
-        """Check if git is available on the system."""
-        if self._git_available is not None:
-            return self._git_available
+        """Check if git is available on the system (a PATH lookup, no subprocess)."""
+        if self._git_available is None:
+            self._git_available = _GIT_EXECUTABLE is not None
         
-        try:
-            result = subprocess.run(
-                ['git', '--version'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            self._git_available = result.returncode == 0
-            # Configure safe directory when we first detect git is available
-            if self._git_available:
-                self._configure_safe_directory()
-            return self._git_available
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            self._git_available = False
-            return False
+        # Configure safe directory when we first detect git is available
+        if self._git_available:
+            self._configure_safe_directory()
+        return self._git_available
     
     def _is_binary_file(self, path: Path) -> bool:
         """
         Check if a file is binary.
         
-        Uses the same logic as FileService to detect binary files.
+        Verdicts are cached until the file's mtime or size changes. Files
+        over 10MB count as binary. Otherwise only the first 8KB is
+        read: known binary signatures are rejected and text with a Unicode
+        byte order mark accepted without scanning (UTF-16 text legitimately
+        contains NULs); anything else is searched for NUL bytes, which is
+        git's own heuristic.
         
         Args:
             path: The file path to check
@@ -56,41 +219,42 @@ class GitService:
         Returns:
             bool: True if binary, False if text
         """
-        if not path.exists() or not path.is_file():
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        if not S_ISREG(st.st_mode):
             return False
         
         # Check file size (reject files > 10MB)
-        file_size = path.stat().st_size
-        if file_size > 10 * 1024 * 1024:  # 10MB
+        if st.st_size > 10 * 1024 * 1024:  # 10MB
             return True
         
+        # An unchanged file keeps its verdict
+        cache_key = (str(path), st.st_mtime_ns, st.st_size)
+        cached = self._binary_cache.get(cache_key)
+        if cached is not None:
+            self._binary_cache.move_to_end(cache_key)
+            return cached
+        
         try:
-            # Read first 512 bytes to check for null bytes
             with open(path, 'rb') as f:
-                chunk = f.read(512)
-                # Check for null bytes (binary indicator)
-                if b'\x00' in chunk:
-                    return True
-            
-            # Attempt UTF-8 validation on entire file (for small files)
-            # For larger files, we've already checked the first 512 bytes
-            if file_size <= 1024 * 1024:  # 1MB - validate entire file
-                try:
-                    path.read_text(encoding='utf-8')
-                except UnicodeDecodeError:
-                    return True
-            else:
-                # For larger files, try to decode first chunk
-                try:
-                    chunk.decode('utf-8')
-                except UnicodeDecodeError:
-                    return True
-                    
-        except (IOError, PermissionError):
+                chunk = f.read(_BINARY_PROBE_SIZE)
+        except OSError:
             # If we can't read the file, assume it's binary for safety
             return True
         
-        return False
+        if chunk.startswith(_BINARY_MAGICS):
+            is_binary = True
+        elif chunk.startswith(_UNICODE_BOMS):
+            is_binary = False
+        else:
+            is_binary = b'\x00' in chunk
+        
+        self._binary_cache[cache_key] = is_binary
+        if len(self._binary_cache) > _BINARY_CACHE_SIZE:
+            self._binary_cache.popitem(last=False)
+        return is_binary
     
     def _configure_safe_directory(self) -> bool:
         """
@@ -98,28 +262,35 @@ class GitService:
         This is needed when the vault directory is owned by a different user
         (e.g., in containers where the directory is mounted from the host).
         
+        Each directory is configured once per process.
+        
         Returns:
             bool: True if configuration was successful or already set
         """
         try:
-            vault_path_str = str(self.vault_path.resolve())
-            result = subprocess.run(
-                ['git', 'config', '--global', '--add', 'safe.directory', vault_path_str],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.returncode == 0:
-                logger.info(f"Configured git safe.directory for {vault_path_str}")
-                return True
-            else:
-                # If it's already configured, that's fine
-                if 'already exists' in result.stderr.lower():
-                    logger.debug(f"Git safe.directory already configured for {vault_path_str}")
+            vault_path_str = str(self._resolved_vault)
+            with _git_env_lock:
+                if vault_path_str in _safe_directories_configured:
                     return True
-                logger.warning(f"Failed to configure git safe.directory: {result.stderr}")
-                return False
+                
+                result = self._run_git(
+                    ['config', '--global', '--add', 'safe.directory', vault_path_str],
+                    timeout=5,
+                    in_vault=False
+                )
+                
+                if result.returncode == 0:
+                    _safe_directories_configured.add(vault_path_str)
+                    logger.info(f"Configured git safe.directory for {vault_path_str}")
+                    return True
+                else:
+                    # If it's already configured, that's fine
+                    if 'already exists' in result.stderr.lower():
+                        _safe_directories_configured.add(vault_path_str)
+                        logger.debug(f"Git safe.directory already configured for {vault_path_str}")
+                        return True
+                    logger.warning(f"Failed to configure git safe.directory: {result.stderr}")
+                    return False
         except Exception as e:
             logger.warning(f"Error configuring git safe.directory: {str(e)}")
             return False
@@ -129,47 +300,43 @@ class GitService:
         Configure git user name and email for commits.
         Uses default values if not already configured.
         
+        Runs once per process; both settings are read with a single
+        `git config --get-regexp` call.
+        
         Returns:
             bool: True if configuration was successful
         """
+        global _git_user_configured
+        
         try:
-            # Check if user.name is already set
-            name_result = subprocess.run(
-                ['git', 'config', '--global', 'user.name'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            # Only set if not already configured
-            if name_result.returncode != 0 or not name_result.stdout.strip():
-                subprocess.run(
-                    ['git', 'config', '--global', 'user.name', 'KBase'],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                logger.info("Configured git user.name to 'KBase'")
-            
-            # Check if user.email is already set
-            email_result = subprocess.run(
-                ['git', 'config', '--global', 'user.email'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            # Only set if not already configured
-            if email_result.returncode != 0 or not email_result.stdout.strip():
-                subprocess.run(
-                    ['git', 'config', '--global', 'user.email', 'kbase@localhost'],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
+            with _git_env_lock:
+                if _git_user_configured:
+                    return True
+                
+                # Read user.name and user.email together; exit code 1 means neither is set
+                result = self._run_git(
+                    ['config', '--global', '--get-regexp', r'^user\.(name|email)$'],
+                    timeout=5,
+                    in_vault=False
                 )
-                logger.info("Configured git user.email to 'kbase@localhost'")
-            
-            return True
+                configured = set()
+                if result.returncode == 0:
+                    for line in result.stdout.splitlines():
+                        key, _, value = line.partition(' ')
+                        if value.strip():
+                            configured.add(key.lower())
+                
+                # Only set values that aren't already configured
+                if 'user.name' not in configured:
+                    self._run_git(['config', '--global', 'user.name', 'KBase'], timeout=5, in_vault=False)
+                    logger.info("Configured git user.name to 'KBase'")
+                
+                if 'user.email' not in configured:
+                    self._run_git(['config', '--global', 'user.email', 'kbase@localhost'], timeout=5, in_vault=False)
+                    logger.info("Configured git user.email to 'kbase@localhost'")
+                
+                _git_user_configured = True
+                return True
         except Exception as e:
             logger.warning(f"Error configuring git user: {str(e)}")
             return False
@@ -181,6 +348,11 @@ class GitService:
         Returns:
             bool: True if git is initialized or already exists, False on error
         """
+        vault_key = str(self._resolved_vault)
+        if vault_key in _initialized_vaults:
+            self._initialized = True
+            return True
+        
         if not self._is_git_available():
             error_msg = "Git is not available on this system"
             self._last_error = error_msg
@@ -194,22 +366,18 @@ class GitService:
         # Configure git user identity for commits
         self._configure_git_user()
         
-        git_dir = self.vault_path / '.git'
-        if git_dir.exists() and git_dir.is_dir():
+        # An existing repository always has .git/HEAD; one stat settles it
+        if os.path.isfile(os.path.join(self._git_dir, 'HEAD')):
             self._initialized = True
+            _initialized_vaults.add(vault_key)
             return True
         
         try:
-            result = subprocess.run(
-                ['git', 'init'],
-                cwd=str(self.vault_path),
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            result = self._run_git(['init'])
             
             if result.returncode == 0:
                 self._initialized = True
+                _initialized_vaults.add(vault_key)
                 logger.info(f"Initialized git repository in {self.vault_path}")
                 return True
             else:
@@ -239,44 +407,29 @@ class GitService:
         Returns:
             bool: True if .gitignore is created/updated successfully
         """
-        gitignore_path = self.vault_path / '.gitignore'
-        
-        # Define .gitignore patterns
-        gitignore_content = """# Binary files (common extensions)
-*.png
-*.jpg
-*.jpeg
-*.gif
-*.bmp
-*.ico
-*.svg
-*.webp
-*.pdf
-*.zip
-*.tar
-*.gz
-*.exe
-*.dll
-*.so
-*.dylib
-
-# Resources directory
-_resources/
-
-# Git directory
-.git/
-"""
+        gitignore_path = os.path.join(self._vault_cwd, '.gitignore')
         
         try:
-            # Check if .gitignore exists and has the correct content
-            if gitignore_path.exists():
-                existing_content = gitignore_path.read_text(encoding='utf-8')
-                # If content matches, no need to update
-                if existing_content.strip() == gitignore_content.strip():
+            # A file we already checked or wrote (same mtime and size) needs
+            # only a stat; otherwise compare its bytes with the canonical ones
+            try:
+                st = os.stat(gitignore_path)
+                signature = (st.st_mtime_ns, st.st_size)
+                if signature == self._gitignore_signature:
                     return True
+                if st.st_size == len(_GITIGNORE_BYTES):
+                    with open(gitignore_path, 'rb') as f:
+                        if f.read() == _GITIGNORE_BYTES:
+                            self._gitignore_signature = signature
+                            return True
+            except FileNotFoundError:
+                pass
             
             # Write .gitignore
-            gitignore_path.write_text(gitignore_content, encoding='utf-8')
+            with open(gitignore_path, 'wb') as f:
+                f.write(_GITIGNORE_BYTES)
+            st = os.stat(gitignore_path)
+            self._gitignore_signature = (st.st_mtime_ns, st.st_size)
             logger.info(f"Created/updated .gitignore in {self.vault_path}")
             return True
             
@@ -311,99 +464,8 @@ _resources/
             return False
         
         try:
-            # Check if there are any changes
-            status_result = subprocess.run(
-                ['git', 'status', '--porcelain'],
-                cwd=str(self.vault_path),
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if status_result.returncode != 0:
-                error_msg = f"Git status failed: {status_result.stderr}"
-                self._last_error = error_msg
-                self._last_error_time = time.time()
-                logger.error(error_msg)
-                return False
-            
-            # If no changes, nothing to commit
-            if not status_result.stdout.strip():
-                return True
-            
-            # Find all text files and stage them
-            text_files = []
-            for file_path in self.vault_path.rglob('*'):
-                # Skip .git directory
-                if '.git' in file_path.parts:
-                    continue
-                
-                # Skip .gitignore itself (it's already handled)
-                if file_path.name == '.gitignore':
-                    continue
-                
-                if file_path.is_file() and not self._is_binary_file(file_path):
-                    # Get relative path from vault root
-                    try:
-                        rel_path = file_path.relative_to(self.vault_path)
-                        text_files.append(rel_path)
-                    except ValueError:
-                        # File is outside vault (shouldn't happen)
-                        continue
-            
-            # Stage all text files
-            if text_files:
-                # Use git add . to stage all files (gitignore will handle exclusions)
-                add_result = subprocess.run(
-                    ['git', 'add', '.'],
-                    cwd=str(self.vault_path),
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-                
-                if add_result.returncode != 0:
-                    error_msg = f"Git add failed: {add_result.stderr}"
-                    self._last_error = error_msg
-                    self._last_error_time = time.time()
-                    logger.error(error_msg)
-                    return False
-            
-            # Check if there are staged changes
-            diff_result = subprocess.run(
-                ['git', 'diff', '--cached', '--quiet'],
-                cwd=str(self.vault_path),
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            # If diff returns 0, there are no staged changes
-            if diff_result.returncode == 0:
-                return True
-            
-            # Commit changes
-            commit_result = subprocess.run(
-                ['git', 'commit', '-m', 'Auto-commit'],
-                cwd=str(self.vault_path),
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if commit_result.returncode == 0:
-                self._last_commit_time = time.time()
-                self._last_error = None
-                self._last_error_time = None
-                logger.info("Successfully committed changes to git")
-                return True
-            else:
-                error_msg = f"Git commit failed: {commit_result.stderr}"
-                self._last_error = error_msg
-                self._last_error_time = time.time()
-                logger.error(error_msg)
-                return False
-                
+            with _git_write_lock:
+                return self._commit_all()
         except subprocess.TimeoutExpired:
             error_msg = "Git operation timed out"
             self._last_error = error_msg
@@ -417,6 +479,156 @@ _resources/
             logger.error(error_msg, exc_info=True)
             return False
     
+    def _commit_all(self) -> bool:
+        """Stage and commit every change; the caller holds _git_write_lock."""
+        # Check if there are any changes (NUL-separated entries, so
+        # paths need no unquoting)
+        status_result = self._run_git(['status', '--porcelain=v1', '-z'])
+        
+        if status_result.returncode != 0:
+            error_msg = f"Git status failed: {status_result.stderr}"
+            self._last_error = error_msg
+            self._last_error_time = time.time()
+            logger.error(error_msg)
+            return False
+        
+        # If no changes, nothing to commit
+        changes = [entry for entry in status_result.stdout.split('\0') if entry]
+        if not changes:
+            return True
+        logger.debug("Committing %d changed paths", len(changes))
+        
+        # Stage everything, including deletions; .gitignore (kept up to
+        # date by ensure_gitignore) excludes binaries and _resources, so
+        # there is no need to walk and sniff the vault first
+        add_result = self._run_git(['add', '-A'], timeout=30)
+        
+        if add_result.returncode != 0:
+            error_msg = f"Git add failed: {add_result.stderr}"
+            self._last_error = error_msg
+            self._last_error_time = time.time()
+            logger.error(error_msg)
+            return False
+        
+        # Commit changes; status already showed there is something to
+        # stage, so no separate `git diff --cached` check is needed
+        commit_result = self._run_git(['commit', '-m', 'Auto-commit'], timeout=30)
+        
+        if commit_result.returncode == 0:
+            self._last_commit_time = time.time()
+            self._last_error = None
+            self._last_error_time = None
+            self._forget_history()
+            logger.info("Successfully committed changes to git")
+            return True
+        elif self._is_nothing_to_commit(commit_result):
+            # Staging left the index identical to HEAD
+            return True
+        else:
+            error_msg = f"Git commit failed: {commit_result.stderr}"
+            self._last_error = error_msg
+            self._last_error_time = time.time()
+            logger.error(error_msg)
+            return False
+    
+    def _read_head(self) -> Optional[str]:
+        """
+        Read the commit HEAD points at straight from .git, without running git.
+        
+        Returns:
+            Optional[str]: The HEAD commit hash, or None before the first commit
+        """
+        try:
+            with open(os.path.join(self._git_dir, 'HEAD'), encoding='utf-8') as f:
+                head = f.read().strip()
+        except OSError:
+            return None
+        
+        if not head.startswith('ref: '):
+            # Detached HEAD holds the hash itself
+            return head
+        ref = head[5:]
+        
+        try:
+            with open(os.path.join(self._git_dir, ref), encoding='utf-8') as f:
+                return f.read().strip()
+        except OSError:
+            pass
+        
+        # Fall back to refs packed by git gc
+        try:
+            with open(os.path.join(self._git_dir, 'packed-refs'), encoding='utf-8') as f:
+                for line in f:
+                    sha, _, name = line.rstrip('\n').partition(' ')
+                    if name == ref:
+                        return sha
+        except OSError:
+            pass
+        return None
+    
+    def _recall_history(self, key: Tuple) -> Tuple[bool, Any]:
+        """Look up a stored history lookup, marking it recently used."""
+        # Lookups may run concurrently (the history endpoint overlaps them)
+        with self._history_lock:
+            try:
+                self._history_cache.move_to_end(key)
+            except KeyError:
+                return False, None
+            return True, self._history_cache[key]
+    
+    def _remember_history(self, key: Tuple, value: Any) -> None:
+        """Store a history lookup, evicting the least recently used entry."""
+        with self._history_lock:
+            self._history_cache[key] = value
+            if len(self._history_cache) > _HISTORY_CACHE_SIZE:
+                self._history_cache.popitem(last=False)
+    
+    def _forget_history(self) -> None:
+        """Drop every stored history lookup after a commit."""
+        with self._history_lock:
+            self._history_cache.clear()
+    
+    def _is_nothing_to_commit(self, result: subprocess.CompletedProcess) -> bool:
+        """Check whether a failed `git commit` only found nothing to commit."""
+        output = f"{result.stdout}\n{result.stderr}"
+        return any(
+            marker in output
+            for marker in ('nothing to commit', 'nothing added to commit', 'no changes added to commit')
+        )
+    
+    def collect_garbage(self) -> bool:
+        """
+        Run `git gc --auto` with git's usual threshold.
+        
+        Automatic collection is disabled for every other git call so that
+        commits never stall on it; the background commit task calls this
+        instead, and it only does work once enough loose objects pile up.
+        
+        Returns:
+            bool: True if git gc succeeded or had nothing to do, False on error
+        """
+        if not self._is_git_available():
+            return False
+        
+        # Ensure git is initialized
+        if not self._initialized:
+            if not self.initialize_git():
+                return False
+        
+        try:
+            # A later -c overrides the gc.auto=0 default
+            result = self._run_git(
+                ['-c', f'gc.auto={_GC_AUTO_THRESHOLD}', 'gc', '--auto', '--quiet'],
+                timeout=600
+            )
+            if result.returncode != 0:
+                logger.warning("Git gc failed: %s", result.stderr)
+                return False
+            return True
+        except subprocess.TimeoutExpired:
+            logger.warning("Git gc timed out")
+            return False
+    
     def get_status(self) -> Dict:
         """
         Get the current git service status.
@@ -434,12 +646,23 @@ _resources/
             "last_error_time": self._last_error_time
         }
     
-    def get_file_commits(self, path: str) -> List[Dict[str, Union[str, int]]]:
+    def get_file_commits(
+        self,
+        path: str,
+        limit: Optional[int] = 50,
+        follow: bool = False
+    ) -> List[Dict[str, Union[str, int]]]:
         """
         Get commit history for a specific file.
         
+        By default only the newest 50 commits under the file's current name
+        are returned; `--follow` rename detection diffs every commit pair, so
+        it is opt-in for callers that need history from before a rename.
+        
         Args:
             path: The file path (relative to vault root)
+            limit: Stop after this many commits (newest first); None for all
+            follow: Also list commits made under the file's previous names
             
         Returns:
             List[Dict]: List of commits with hash, timestamp, and message
@@ -458,72 +681,185 @@ _resources/
         
         # Validate path is within vault
         file_path = self.vault_path / path.lstrip('/')
-        logger.info(f"Looking for file at: {file_path}")
-        logger.info(f"File exists: {file_path.exists()}, Is file: {file_path.is_file() if file_path.exists() else 'N/A'}")
-        
-        if not file_path.exists() or not file_path.is_file():
+        if not file_path.is_file():
             raise ValueError(f"File not found: {path}")
         
         # Get relative path from vault root
         try:
-            rel_path = file_path.relative_to(self.vault_path.resolve())
-            logger.info(f"Relative path: {rel_path}")
+            rel_path = file_path.relative_to(self._resolved_vault)
         except ValueError:
             raise ValueError(f"Path is outside vault: {path}")
         
+        # Use as_posix() to ensure forward slashes (git expects this)
+        git_path = rel_path.as_posix()
+        
+        # The history of a path only changes when HEAD moves
+        cache_key = ('commits', git_path, self._read_head(), limit, follow)
+        found, cached = self._recall_history(cache_key)
+        if found:
+            return list(cached)
+        
+        # Format: hash|timestamp|message
+        args = ['log']
+        if limit is not None:
+            args.append(f'-n{limit}')
+        if follow:
+            # Track the file across renames
+            args.append('--follow')
+        args += ['--format=%H|%ct|%s', '--', git_path]
+        
         try:
-            # Use git log --follow to track file renames
-            # Format: hash|timestamp|message
-            # Use as_posix() to ensure forward slashes (git expects this)
-            git_path = rel_path.as_posix()
-            logger.info(f"Running git log for path: {repr(git_path)}")
-            logger.info(f"Full command: git log --follow --format=%H|%ct|%s -- {repr(git_path)}")
-            
-            result = subprocess.run(
-                ['git', 'log', '--follow', '--format=%H|%ct|%s', '--', git_path],
-                cwd=str(self.vault_path),
-                capture_output=True,
-                text=True,
+            logger.debug("Running git %s", args)
+            
+            # Parse commits as git prints them rather than buffering the
+            # whole history, so a limit can stop the walk early. A timer
+            # kills git if the walk outlives the timeout a buffered run had
+            commits = []
+            returncode = None
+            timed_out = threading.Event()
+            with tempfile.TemporaryFile() as stderr_file:
+                with self._popen_git(args, stderr_file) as proc:
+                    def kill_on_timeout():
+                        timed_out.set()
+                        proc.kill()
+                    
+                    watchdog = threading.Timer(_GIT_LOG_TIMEOUT, kill_on_timeout)
+                    watchdog.start()
+                    try:
+                        for line in proc.stdout:
+                            commit_hash, _, rest = line.rstrip('\n').partition('|')
+                            timestamp, _, message = rest.partition('|')
+                            if not timestamp.isdigit():
+                                # Skip lines without a valid timestamp
+                                continue
+                            commits.append({
+                                "hash": commit_hash,
+                                "timestamp": int(timestamp),
+                                "message": message
+                            })
+                            if limit is not None and len(commits) >= limit:
+                                proc.terminate()
+                                break
+                        else:
+                            returncode = proc.wait()
+                    finally:
+                        watchdog.cancel()
+                
+                if timed_out.is_set():
+                    raise subprocess.TimeoutExpired(['git', *args], _GIT_LOG_TIMEOUT)
+                
+                if returncode:
+                    stderr_file.seek(0)
+                    stderr = stderr_file.read().decode('utf-8', 'replace')
+                    # Log the error for debugging
+                    logger.warning("Git log failed for path %r: %s", git_path, stderr)
+                    # If file has no history, return empty list
+                    if 'does not exist' in stderr or 'no such path' in stderr.lower() or 'fatal:' in stderr.lower():
+                        logger.debug("No history found for path %r (file may not be tracked)", git_path)
+                        self._remember_history(cache_key, [])
+                        return []
+                    error_msg = f"Git log failed: {stderr}"
+                    self._last_error = error_msg
+                    self._last_error_time = time.time()
+                    logger.error(error_msg)
+                    raise ValueError(error_msg)
+            
+            self._remember_history(cache_key, commits)
+            return list(commits)
+            
+        except subprocess.TimeoutExpired:
+            error_msg = "Git log operation timed out"
+            self._last_error = error_msg
+            self._last_error_time = time.time()
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        except Exception as e:
+            error_msg = f"Error getting file commits: {str(e)}"
+            self._last_error = error_msg
+            self._last_error_time = time.time()
+            logger.error(error_msg, exc_info=True)
+            raise ValueError(error_msg)
+    
+    def get_file_commits_bulk(self, paths: List[str]) -> Dict[str, List[Dict[str, Union[str, int]]]]:
+        """
+        Get commit history for several files with a single `git log`.
+        
+        Unlike get_file_commits this does not follow renames; use the
+        single-file call when rename tracking matters.
+        
+        Args:
+            paths: File paths (relative to vault root)
+            
+        Returns:
+            Dict: Each requested path mapped to its list of commits (newest
+            first), in the same format as get_file_commits
+            
+        Raises:
+            ValueError: If git is not available or a path is invalid
+        """
+        if not self._is_git_available():
+            raise ValueError("Git is not available on this system")
+        
+        # Ensure git is initialized
+        if not self._initialized:
+            if not self.initialize_git():
+                raise ValueError("Failed to initialize git repository")
+        
+        vault_resolved = self._resolved_vault
+        results: Dict[str, List[Dict[str, Union[str, int]]]] = {}
+        requested: Dict[str, List[str]] = {}
+        for path in paths:
+            file_path = self.vault_path / path.lstrip('/')
+            if not file_path.is_file():
+                raise ValueError(f"File not found: {path}")
+            try:
+                git_path = file_path.relative_to(vault_resolved).as_posix()
+            except ValueError:
+                raise ValueError(f"Path is outside vault: {path}")
+            results[path] = []
+            requested.setdefault(git_path, []).append(path)
+        
+        if not requested:
+            return results
+        
+        try:
+            # Each commit starts with a \x01-prefixed header line, followed
+            # by the names of the requested files it touched
+            result = self._run_git(
+                ['-c', 'core.quotePath=false', 'log',
+                 '--format=%x01%H|%ct|%s', '--name-only', '--', *requested],
                 timeout=30
             )
             
-            logger.info(f"Git log return code: {result.returncode}")
-            logger.info(f"Git log stdout length: {len(result.stdout)}")
-            logger.info(f"Git log stderr: {result.stderr[:200] if result.stderr else 'None'}")
-            
             if result.returncode != 0:
-                # Log the error for debugging
-                logger.warning(f"Git log failed for path '{git_path}': {result.stderr}")
-                # If file has no history, return empty list
-                if 'does not exist' in result.stderr or 'no such path' in result.stderr.lower() or 'fatal:' in result.stderr.lower():
-                    logger.info(f"No history found for path '{git_path}' (file may not be tracked)")
-                    return []
+                # A repository without commits has no history to report
+                if 'does not have any commits' in result.stderr:
+                    return results
                 error_msg = f"Git log failed: {result.stderr}"
                 self._last_error = error_msg
                 self._last_error_time = time.time()
                 logger.error(error_msg)
                 raise ValueError(error_msg)
             
-            commits = []
-            for line in result.stdout.strip().split('\n'):
-                if not line.strip():
-                    continue
-                parts = line.split('|', 2)
-                if len(parts) >= 2:
-                    commit_hash = parts[0]
+            commit = None
+            for line in result.stdout.split('\n'):
+                if line.startswith('\x01'):
+                    commit_hash, _, rest = line[1:].partition('|')
+                    timestamp, _, message = rest.partition('|')
                     try:
-                        timestamp = int(parts[1])
-                        message = parts[2] if len(parts) > 2 else ""
-                        commits.append({
+                        commit = {
                             "hash": commit_hash,
-                            "timestamp": timestamp,
+                            "timestamp": int(timestamp),
                             "message": message
-                        })
+                        }
                     except ValueError:
                         # Skip invalid timestamp
-                        continue
+                        commit = None
+                elif line and commit is not None:
+                    for path in requested.get(line, ()):
+                        results[path].append(dict(commit))
             
-            return commits
+            return results
             
         except subprocess.TimeoutExpired:
             error_msg = "Git log operation timed out"
@@ -531,12 +867,6 @@ _resources/
             self._last_error_time = time.time()
             logger.error(error_msg)
             raise ValueError(error_msg)
-        except Exception as e:
-            error_msg = f"Error getting file commits: {str(e)}"
-            self._last_error = error_msg
-            self._last_error_time = time.time()
-            logger.error(error_msg, exc_info=True)
-            raise ValueError(error_msg)
     
     def get_file_content_at_commit(self, path: str, commit_hash: str) -> str:
         """
@@ -563,35 +893,23 @@ _resources/
         # Validate path is within vault
         file_path = self.vault_path / path.lstrip('/')
         try:
-            rel_path = file_path.relative_to(self.vault_path.resolve())
+            rel_path = file_path.relative_to(self._resolved_vault)
         except ValueError:
             raise ValueError(f"Path is outside vault: {path}")
         
         try:
-            # Use git show to get file content at specific commit
+            # Read the blob through the shared cat-file process
             # Use as_posix() to ensure forward slashes (git expects this)
             git_path = rel_path.as_posix()
-            result = subprocess.run(
-                ['git', 'show', f'{commit_hash}:{git_path}'],
-                cwd=str(self.vault_path),
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            content = self._cat_file(f'{commit_hash}:{git_path}')
             
-            if result.returncode != 0:
-                error_msg = f"Failed to get file content: {result.stderr}"
-                if 'not found' in result.stderr.lower() or 'does not exist' in result.stderr.lower():
-                    raise ValueError(f"File not found in commit {commit_hash[:8]}")
-                self._last_error = error_msg
-                self._last_error_time = time.time()
-                logger.error(error_msg)
-                raise ValueError(error_msg)
+            if content is None:
+                raise ValueError(f"File not found in commit {commit_hash[:8]}")
             
-            return result.stdout
+            return content.decode('utf-8')
             
-        except subprocess.TimeoutExpired:
-            error_msg = "Git show operation timed out"
+        except OSError as e:
+            error_msg = f"Failed to get file content: {str(e)}"
             self._last_error = error_msg
             self._last_error_time = time.time()
             logger.error(error_msg)
@@ -606,6 +924,95 @@ _resources/
             logger.error(error_msg, exc_info=True)
             raise ValueError(error_msg)
     
+    def _start_cat_file(self) -> subprocess.Popen:
+        """Start the persistent `git cat-file --batch` process for the vault."""
+        return subprocess.Popen(
+            ['git', *_GIT_CONFIG_ARGS, 'cat-file', '--batch'],
+            executable=_GIT_EXECUTABLE,
+            cwd=self._vault_cwd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=self._git_env,
+            bufsize=0
+        )
+    
+    def _cat_file(self, spec: str) -> Optional[bytes]:
+        """
+        Read an object through the persistent `git cat-file --batch` process.
+        
+        Reusing one process saves a fork/exec and a repository open per
+        lookup. The process is started on first use and restarted if it
+        has exited.
+        
+        Args:
+            spec: Object name, e.g. "<commit>:<path>"
+            
+        Returns:
+            Optional[bytes]: The object's content, or None if it doesn't exist
+            
+        Raises:
+            ValueError: If the spec can't be sent over the batch protocol
+            OSError: If git can't be started or the process dies mid-read
+        """
+        if '\n' in spec:
+            raise ValueError(f"Invalid object name: {spec!r}")
+        
+        with self._cat_file_lock:
+            for attempt in range(2):
+                proc = self._cat_file_proc
+                if proc is None or proc.poll() is not None:
+                    proc = self._cat_file_proc = self._start_cat_file()
+                try:
+                    proc.stdin.write(spec.encode('utf-8') + b'\n')
+                    header = proc.stdout.readline()
+                except BrokenPipeError:
+                    header = b''
+                if header:
+                    break
+                # The process exited (e.g. the repository was replaced); retry once
+                self._close_cat_file()
+            else:
+                raise OSError("git cat-file exited unexpectedly")
+            
+            # "<spec> missing" / "<spec> ambiguous" or "<sha> <type> <size>"
+            fields = header.split()
+            if len(fields) != 3 or fields[1] == b'missing':
+                return None
+            size = int(fields[2])
+            
+            data = bytearray()
+            while len(data) < size + 1:  # content plus trailing newline
+                chunk = proc.stdout.read(size + 1 - len(data))
+                if not chunk:
+                    self._close_cat_file()
+                    raise OSError("git cat-file exited unexpectedly")
+                data += chunk
+            return bytes(data[:size])
+    
+    def _close_cat_file(self) -> None:
+        """Terminate the `git cat-file --batch` process, if running."""
+        proc = self._cat_file_proc
+        self._cat_file_proc = None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            proc.kill()
+            proc.wait()
+    
+    def close(self) -> None:
+        """Release the persistent git processes held by this service."""
+        with self._cat_file_lock:
+            self._close_cat_file()
+    
+    def __del__(self):
+        proc = getattr(self, '_cat_file_proc', None)
+        if proc is not None and proc.poll() is None:
+            proc.kill()
+    
     def commit_single_file(self, path: str) -> bool:
         """
         Commit only the specified file.
@@ -649,92 +1056,22 @@ _resources/
             logger.error(error_msg)
             return False
         
+        # Get relative path from vault root
         try:
-            # Get relative path from vault root
-            try:
-                rel_path = file_path.relative_to(self.vault_path.resolve())
-            except ValueError:
-                error_msg = f"Path is outside vault: {path}"
-                self._last_error = error_msg
-                self._last_error_time = time.time()
-                logger.error(error_msg)
-                return False
-            
-            # Use as_posix() to ensure forward slashes (git expects this)
-            git_path = rel_path.as_posix()
-            
-            # Check if file has changes
-            status_result = subprocess.run(
-                ['git', 'status', '--porcelain', git_path],
-                cwd=str(self.vault_path),
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if status_result.returncode != 0:
-                error_msg = f"Git status failed: {status_result.stderr}"
-                self._last_error = error_msg
-                self._last_error_time = time.time()
-                logger.error(error_msg)
-                return False
-            
-            # If no changes, nothing to commit
-            if not status_result.stdout.strip():
-                return True
-            
-            # Stage the file
-            add_result = subprocess.run(
-                ['git', 'add', git_path],
-                cwd=str(self.vault_path),
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if add_result.returncode != 0:
-                error_msg = f"Git add failed: {add_result.stderr}"
-                self._last_error = error_msg
-                self._last_error_time = time.time()
-                logger.error(error_msg)
-                return False
-            
-            # Check if there are staged changes
-            diff_result = subprocess.run(
-                ['git', 'diff', '--cached', '--quiet', git_path],
-                cwd=str(self.vault_path),
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            # If diff returns 0, there are no staged changes
-            if diff_result.returncode == 0:
-                return True
-            
-            # Commit the file with descriptive message
-            filename = file_path.name
-            commit_result = subprocess.run(
-                ['git', 'commit', '-m', f'Auto-commit: {filename}'],
-                cwd=str(self.vault_path),
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if commit_result.returncode == 0:
-                self._last_commit_time = time.time()
-                self._last_error = None
-                self._last_error_time = None
-                logger.info(f"Successfully committed file: {path}")
-                return True
-            else:
-                error_msg = f"Git commit failed: {commit_result.stderr}"
-                self._last_error = error_msg
-                self._last_error_time = time.time()
-                logger.error(error_msg)
-                return False
-                
+            rel_path = file_path.relative_to(self._resolved_vault)
+        except ValueError:
+            error_msg = f"Path is outside vault: {path}"
+            self._last_error = error_msg
+            self._last_error_time = time.time()
+            logger.error(error_msg)
+            return False
+        
+        # Use as_posix() to ensure forward slashes (git expects this)
+        git_path = rel_path.as_posix()
+        
+        try:
+            with _git_write_lock:
+                return self._commit_file(git_path)
         except subprocess.TimeoutExpired:
             error_msg = "Git operation timed out"
             self._last_error = error_msg
@@ -748,6 +1085,51 @@ _resources/
             logger.error(error_msg, exc_info=True)
             return False
     
+    def _commit_file(self, git_path: str) -> bool:
+        """
+        Stage and commit a single file; the caller holds _git_write_lock.
+        
+        Args:
+            git_path: Vault-relative POSIX path of the file to commit
+            
+        Returns:
+            bool: True if commit was successful or no changes, False on error
+        """
+        # Stage the file; an unchanged file stages nothing and the commit
+        # below reports that, so no status/diff pre-checks
+        add_result = self._run_git(['add', '--', git_path], timeout=30)
+        
+        if add_result.returncode != 0:
+            error_msg = f"Git add failed: {add_result.stderr}"
+            self._last_error = error_msg
+            self._last_error_time = time.time()
+            logger.error(error_msg)
+            return False
+        
+        # Commit the file with descriptive message
+        filename = git_path.rsplit('/', 1)[-1]
+        commit_result = self._run_git(
+            ['commit', '-m', f'Auto-commit: {filename}', '--', git_path],
+            timeout=30
+        )
+        
+        if commit_result.returncode == 0:
+            self._last_commit_time = time.time()
+            self._last_error = None
+            self._last_error_time = None
+            self._forget_history()
+            logger.info("Successfully committed file: %s", git_path)
+            return True
+        elif self._is_nothing_to_commit(commit_result):
+            # The file matches HEAD already
+            return True
+        else:
+            error_msg = f"Git commit failed: {commit_result.stderr}"
+            self._last_error = error_msg
+            self._last_error_time = time.time()
+            logger.error(error_msg)
+            return False
+    
     def get_current_commit_for_file(self, path: str) -> Optional[str]:
         """
         Get the commit hash that contains the current working tree version of the file.
@@ -769,48 +1151,49 @@ _resources/
         
         # Validate path is within vault
         file_path = self.vault_path / path.lstrip('/')
-        if not file_path.exists() or not file_path.is_file():
+        try:
+            st = file_path.stat()
+        except OSError:
+            return None
+        if not S_ISREG(st.st_mode):
             return None
         
         try:
             # Get relative path from vault root
             try:
-                rel_path = file_path.relative_to(self.vault_path.resolve())
+                rel_path = file_path.relative_to(self._resolved_vault)
             except ValueError:
                 return None
             
             # Use as_posix() to ensure forward slashes (git expects this)
             git_path = rel_path.as_posix()
             
+            # The answer holds until HEAD moves or the file is written
+            cache_key = ('current', git_path, self._read_head(), st.st_mtime_ns, st.st_size)
+            found, cached = self._recall_history(cache_key)
+            if found:
+                return cached
+            
             # Check if file has uncommitted changes
-            status_result = subprocess.run(
-                ['git', 'status', '--porcelain', git_path],
-                cwd=str(self.vault_path),
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            status_result = self._run_git(['status', '--porcelain', git_path])
             
             if status_result.returncode != 0:
                 return None
             
             # If file has changes, return None (not committed)
             if status_result.stdout.strip():
+                self._remember_history(cache_key, None)
                 return None
             
             # Get the commit hash for HEAD version of this file
-            log_result = subprocess.run(
-                ['git', 'log', '-1', '--format=%H', '--', git_path],
-                cwd=str(self.vault_path),
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            log_result = self._run_git(['log', '-1', '--format=%H', '--', git_path])
             
+            current = None
             if log_result.returncode == 0 and log_result.stdout.strip():
-                return log_result.stdout.strip()
+                current = log_result.stdout.strip()
             
-            return None
+            self._remember_history(cache_key, current)
+            return current
             
         except (subprocess.TimeoutExpired, Exception):
             return None
@@ -1,9 +1,9 @@
 """Image service for handling image uploads and storage."""
 
 import os
-import uuid
+import secrets
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
 
 from fastapi import UploadFile
 
@@ -14,33 +14,59 @@ class ImageService:
     """Service for image operations with security validation."""
 
     # Supported image MIME types
-    SUPPORTED_MIME_TYPES = {
+    SUPPORTED_MIME_TYPES = frozenset({
         'image/jpeg',
         'image/jpg',
         'image/png',
         'image/gif',
         'image/webp',
         'image/svg+xml'
-    }
+    })
 
     # Supported file extensions
-    SUPPORTED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg'}
+    SUPPORTED_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg'})
 
     # Maximum file size (10MB default)
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 
+    # Uploads are copied to disk in chunks of this size
+    UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
     def __init__(self):
         self.vault_path = settings.vault_path
 
+    @property
+    def vault_path(self) -> Path:
+        """The vault root holding the _resources directory."""
+        return self._vault_path
+
+    @vault_path.setter
+    def vault_path(self, value: Path) -> None:
+        self._vault_path = value
+        self._resources_path = value / '_resources'
+        self._resources_ready = False
+
     def _get_resources_path(self) -> Path:
         """Get the _resources directory path at vault root."""
-        return self.vault_path / '_resources'
+        return self._resources_path
 
     def _ensure_resources_directory(self) -> Path:
         """Ensure the _resources directory exists and return its path."""
-        resources_path = self._get_resources_path()
-        resources_path.mkdir(parents=True, exist_ok=True)
-        return resources_path
+        # Created once per service; _open_upload_target recreates it if it
+        # disappears later
+        if not self._resources_ready:
+            self._resources_path.mkdir(parents=True, exist_ok=True)
+            self._resources_ready = True
+        return self._resources_path
+
+    def _open_upload_target(self, file_path: Path) -> BinaryIO:
+        """Open an upload's destination, recreating _resources if it was removed."""
+        try:
+            return open(file_path, 'wb')
+        except FileNotFoundError:
+            self._resources_ready = False
+            self._ensure_resources_directory()
+            return open(file_path, 'wb')
 
     def _validate_image_file(self, file: UploadFile) -> None:
         """
@@ -54,7 +80,7 @@ class ImageService:
         """
         # Check file size
         if file.size and file.size > self.MAX_FILE_SIZE:
-            raise ValueError(f"File too large. Maximum size is {self.MAX_FILE_SIZE // (1024*1024)}MB")
+            raise ValueError(self._too_large_message())
 
         # Check MIME type
         if file.content_type not in self.SUPPORTED_MIME_TYPES:
@@ -62,13 +88,17 @@ class ImageService:
 
         # Check file extension as additional validation
         filename = file.filename or ""
-        file_ext = Path(filename).suffix.lower()
+        file_ext = os.path.splitext(filename)[1].lower()
         if file_ext not in self.SUPPORTED_EXTENSIONS:
             raise ValueError(f"Unsupported file extension: {file_ext}. Supported extensions: {', '.join(self.SUPPORTED_EXTENSIONS)}")
 
+    def _too_large_message(self) -> str:
+        """Build the error message for uploads over MAX_FILE_SIZE."""
+        return f"File too large. Maximum size is {self.MAX_FILE_SIZE // (1024*1024)}MB"
+
     def _generate_unique_filename(self, original_filename: str) -> str:
         """
-        Generate a unique filename using UUID.
+        Generate a unique filename from 128 random bits.
 
         Args:
             original_filename: The original filename
@@ -76,8 +106,9 @@ class ImageService:
         Returns:
             str: Unique filename with proper extension
         """
-        file_ext = Path(original_filename).suffix.lower()
-        unique_id = str(uuid.uuid4())
+        file_ext = os.path.splitext(original_filename)[1].lower()
+        # URL-safe base64: 22 characters instead of a 36-character UUID
+        unique_id = secrets.token_urlsafe(16)
         return f"{unique_id}{file_ext}"
 
     def upload_image(self, file: UploadFile) -> str:
@@ -106,17 +137,25 @@ class ImageService:
         file_path = resources_path / unique_filename
 
         try:
-            # Read file content
-            content = file.file.read()
-
-            # Write to disk
-            with open(file_path, 'wb') as f:
-                f.write(content)
+            # Copy to disk a chunk at a time, enforcing the size limit as we
+            # go since the declared size may be missing
+            written = 0
+            with self._open_upload_target(file_path) as f:
+                while chunk := file.file.read(self.UPLOAD_CHUNK_SIZE):
+                    written += len(chunk)
+                    if written > self.MAX_FILE_SIZE:
+                        raise ValueError(self._too_large_message())
+                    f.write(chunk)
 
             # Return path relative to vault root
             return f"/_resources/{unique_filename}"
 
+        except ValueError:
+            # Don't leave a partial file behind
+            file_path.unlink(missing_ok=True)
+            raise
         except Exception as e:
+            file_path.unlink(missing_ok=True)
             raise ValueError(f"Failed to save image: {str(e)}")
 
     def update_image_paths_in_note(self, old_note_path: str, new_note_path: str) -> None:
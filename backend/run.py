@@ -36,11 +36,18 @@ def main():
         print(f"API docs: http://{settings.host}:{settings.port}/docs")
         print("Press Ctrl+C to stop")
         
+        # Auto-reload watches the source tree; only enable it for development
+        reload = os.environ.get("KBASE_DEV") == "1"
+        # The background git commit task and the commit lock are per process,
+        # so extra workers are opt-in
+        workers = 1 if reload else int(os.environ.get("KBASE_WORKERS", "1"))
+        
         uvicorn.run(
             "app.main:app",
             host=settings.host,
             port=settings.port,
-            reload=True
+            reload=reload,
+            workers=workers
         )
     except ImportError as e:
         print(f"Error: Missing dependencies. Please run: uv sync")
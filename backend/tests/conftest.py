@@ -1,19 +1,52 @@
 """Pytest configuration and fixtures."""
 
 import os
+import shutil
 import tempfile
 from pathlib import Path
-from typing import Generator
+from typing import Callable, Dict, Generator
 
 import pytest
 from fastapi.testclient import TestClient
 
+# The app writes git global config (safe.directory entries, a commit identity)
+# while tests run; point it at a per-process file so the suite neither edits the
+# user's ~/.gitconfig nor has parallel pytest-xdist workers contend for its lock
+_GIT_CONFIG_DIR = tempfile.mkdtemp(prefix="kbase-tests-git-")
+os.environ["GIT_CONFIG_GLOBAL"] = os.path.join(_GIT_CONFIG_DIR, "gitconfig")
+# Tests that commit without going through initialize_git still need an identity
+with open(os.environ["GIT_CONFIG_GLOBAL"], "w") as _gitconfig:
+    _gitconfig.write("[user]\n\tname = KBase Tests\n\temail = tests@localhost\n")
 
-@pytest.fixture
-def temp_vault() -> Generator[Path, None, None]:
-    """Create a temporary vault directory for testing."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        vault_path = Path(temp_dir) / "test_vault"
+# Settings are loaded from the environment when the app package is first
+# imported; give that import a valid configuration; the client fixtures then
+# switch the shared app to explicit settings instead of re-importing the package
+os.environ.setdefault("VAULT_PATH", tempfile.gettempdir())
+os.environ.setdefault("DISABLE_AUTH", "true")
+
+from app.api.v1.endpoints import directories  # noqa: E402
+from app.config import Settings  # noqa: E402
+from app.main import apply_settings, create_app, prepare_vault  # noqa: E402
+
+
+# Settings used by every authenticated client and by the token it logs in with
+_AUTH_SETTINGS = {
+    "disable_auth": False,
+    "secret_key": "test-secret-key-for-jwt-signing",
+    "password": "test-password",
+}
+
+
+def pytest_unconfigure(config):
+    """Remove the per-process git global config."""
+    shutil.rmtree(_GIT_CONFIG_DIR, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def vault_template() -> Generator[Path, None, None]:
+    """Build the reference vault contents once per test session."""
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as temp_dir:
+        vault_path = Path(temp_dir) / "template_vault"
         vault_path.mkdir()
         
         # Create some test files
@@ -29,68 +62,91 @@ def temp_vault() -> Generator[Path, None, None]:
 
 
 @pytest.fixture
-def client(temp_vault: Path) -> Generator[TestClient, None, None]:
-    """Create a test client with temporary vault."""
-    # Set environment variables (explicitly disable auth for tests that don't need it)
-    os.environ["VAULT_PATH"] = str(temp_vault)
-    os.environ["DISABLE_AUTH"] = "true"
-    
-    # Clear any cached modules to ensure fresh import
-    import sys
-    modules_to_clear = [mod for mod in sys.modules.keys() if mod.startswith('app.')]
-    for mod in modules_to_clear:
-        del sys.modules[mod]
-    
-    # Import app after setting environment variables
-    from app.main import app
-    
-    # Create test client
-    with TestClient(app) as test_client:
-        yield test_client
+def temp_vault(vault_template: Path) -> Generator[Path, None, None]:
+    """Create a temporary vault directory for testing."""
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as temp_dir:
+        # Tests may modify the vault, so each one gets its own copy
+        vault_path = Path(temp_dir) / "test_vault"
+        shutil.copytree(vault_template, vault_path)
+        
+        yield vault_path
+
+
+@pytest.fixture(scope="session")
+def app_client() -> Generator[TestClient, None, None]:
+    """Start the application once and share its test client across tests."""
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as temp_dir:
+        app = create_app(Settings(vault_path=temp_dir, disable_auth=True))
+        with TestClient(app) as test_client:
+            yield test_client
+
+
+@pytest.fixture(scope="session")
+def git_state_template(app_client: TestClient, vault_template: Path) -> Generator[Path, None, None]:
+    """Run the app's vault preparation (git init, .gitignore, initial commit) once."""
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as temp_dir:
+        vault_path = Path(temp_dir) / "git_template_vault"
+        shutil.copytree(vault_template, vault_path)
+        apply_settings(Settings(vault_path=vault_path, disable_auth=True))
+        prepare_vault()
+        yield vault_path
+
+
+def _attach_vault(vault_path: Path, git_template: Path, **overrides) -> None:
+    """
+    Point the shared app at vault_path in the state prepare_vault() leaves it.
     
-    # Clean up environment
-    env_vars = ["VAULT_PATH", "DISABLE_AUTH"]
-    for var in env_vars:
-        if var in os.environ:
-            del os.environ[var]
+    The per-test vault starts as a copy of the same template, so copying the
+    prepared git metadata gives the same result as preparing it again without
+    running git.
+    """
+    if (git_template / ".git").is_dir():
+        shutil.copytree(git_template / ".git", vault_path / ".git")
+    if (git_template / ".gitignore").is_file():
+        shutil.copy2(git_template / ".gitignore", vault_path / ".gitignore")
+    apply_settings(Settings(vault_path=vault_path, **overrides))
 
 
 @pytest.fixture
-def auth_client(temp_vault: Path) -> Generator[TestClient, None, None]:
-    """Create a test client with authentication configured."""
-    # Set environment variables for authentication (explicitly enable auth)
-    os.environ["VAULT_PATH"] = str(temp_vault)
-    os.environ["DISABLE_AUTH"] = "false"
-    os.environ["SECRET_KEY"] = "test-secret-key-for-jwt-signing"
-    os.environ["PASSWORD"] = "test-password"
-    
-    # Clear any cached modules to ensure fresh import
-    import sys
-    modules_to_clear = [mod for mod in sys.modules.keys() if mod.startswith('app.')]
-    for mod in modules_to_clear:
-        del sys.modules[mod]
-    
-    # Import app after setting environment variables
-    from app.main import app
-    
-    # Create test client
-    with TestClient(app) as test_client:
-        yield test_client
-    
-    # Clean up environment
-    env_vars = ["VAULT_PATH", "DISABLE_AUTH", "SECRET_KEY", "PASSWORD"]
-    for var in env_vars:
-        if var in os.environ:
-            del os.environ[var]
+def client(app_client: TestClient, git_state_template: Path, temp_vault: Path) -> TestClient:
+    """Create a test client with temporary vault."""
+    # Explicitly disable auth for tests that don't need it
+    _attach_vault(temp_vault, git_state_template, disable_auth=True)
+    return app_client
 
 
 @pytest.fixture
-def auth_token(auth_client: TestClient) -> str:
+def auth_client(app_client: TestClient, git_state_template: Path, temp_vault: Path) -> TestClient:
+    """Create a test client with authentication configured."""
+    _attach_vault(temp_vault, git_state_template, **_AUTH_SETTINGS)
+    return app_client
+
+
+@pytest.fixture(scope="session")
+def auth_token(app_client: TestClient, vault_template: Path) -> str:
     """Get a valid authentication token for testing."""
-    response = auth_client.post(
+    # Tokens depend only on the auth settings, so one login serves the whole session
+    apply_settings(Settings(vault_path=vault_template, **_AUTH_SETTINGS))
+    response = app_client.post(
         "/api/v1/auth/login",
         json={"password": "test-password"}
     )
     
     assert response.status_code == 200
     return response.json()["access_token"]
+
+
+@pytest.fixture(scope="session")
+def auth_headers(auth_token: str) -> Dict[str, str]:
+    """Authorization header for authenticated requests."""
+    return {"Authorization": f"Bearer {auth_token}"}
+
+
+@pytest.fixture
+def make_dir() -> Callable[[str], Dict]:
+    """Create a directory for test setup without going through HTTP."""
+    def _make_dir(path: str) -> Dict:
+        # Looked up at call time so the service points at the current test's vault
+        return directories.directory_service.create_directory(path)
+    return _make_dir
+
@@ -1,14 +1,16 @@
 """Tests for directory API endpoints with authentication."""
 
+from typing import Callable, Dict
+
 import pytest
 from fastapi.testclient import TestClient
 
 
-def test_create_directory(auth_client: TestClient, auth_token: str):
+def test_create_directory(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test creating a new directory."""
     response = auth_client.post(
         "/api/v1/directories/test_dir",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -17,11 +19,11 @@ def test_create_directory(auth_client: TestClient, auth_token: str):
     assert data["path"] == "/test_dir"
 
 
-def test_create_nested_directory(auth_client: TestClient, auth_token: str):
+def test_create_nested_directory(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test creating a nested directory."""
     response = auth_client.post(
         "/api/v1/directories/nested/test_dir",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -30,34 +32,28 @@ def test_create_nested_directory(auth_client: TestClient, auth_token: str):
     assert data["path"] == "/nested/test_dir"
 
 
-def test_create_directory_already_exists(auth_client: TestClient, auth_token: str):
+def test_create_directory_already_exists(auth_client: TestClient, auth_headers: Dict[str, str], make_dir: Callable):
     """Test creating a directory that already exists."""
     # First create the directory
-    auth_client.post(
-        "/api/v1/directories/existing_dir",
-        headers={"Authorization": f"Bearer {auth_token}"}
-    )
+    make_dir("existing_dir")
     
     # Try to create it again
     response = auth_client.post(
         "/api/v1/directories/existing_dir",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 409
     assert "already exists" in response.json()["detail"]
 
 
-def test_get_directory(auth_client: TestClient, auth_token: str):
+def test_get_directory(auth_client: TestClient, auth_headers: Dict[str, str], make_dir: Callable):
     """Test getting directory information."""
     # Create a directory first
-    auth_client.post(
-        "/api/v1/directories/test_get_dir",
-        headers={"Authorization": f"Bearer {auth_token}"}
-    )
+    make_dir("test_get_dir")
     
     response = auth_client.get(
         "/api/v1/directories/test_get_dir",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -71,20 +67,17 @@ def test_get_directory(auth_client: TestClient, auth_token: str):
     assert "contents" in data
 
 
-def test_rename_directory(auth_client: TestClient, auth_token: str):
+def test_rename_directory(auth_client: TestClient, auth_headers: Dict[str, str], make_dir: Callable):
     """Test renaming a directory."""
     # Create a directory first
-    auth_client.post(
-        "/api/v1/directories/old_name",
-        headers={"Authorization": f"Bearer {auth_token}"}
-    )
+    make_dir("old_name")
     
     # Rename it
     rename_data = {"new_name": "new_name"}
     response = auth_client.put(
         "/api/v1/directories/old_name",
         json=rename_data,
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -93,18 +86,15 @@ def test_rename_directory(auth_client: TestClient, auth_token: str):
     assert data["path"] == "/new_name"
 
 
-def test_delete_directory(auth_client: TestClient, auth_token: str):
+def test_delete_directory(auth_client: TestClient, auth_headers: Dict[str, str], make_dir: Callable):
     """Test deleting an empty directory."""
     # Create a directory first
-    auth_client.post(
-        "/api/v1/directories/to_delete",
-        headers={"Authorization": f"Bearer {auth_token}"}
-    )
+    make_dir("to_delete")
     
     # Delete it
     response = auth_client.delete(
         "/api/v1/directories/to_delete",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -113,20 +103,17 @@ def test_delete_directory(auth_client: TestClient, auth_token: str):
     assert data["path"] == "/to_delete"
 
 
-def test_move_directory(auth_client: TestClient, auth_token: str):
+def test_move_directory(auth_client: TestClient, auth_headers: Dict[str, str], make_dir: Callable):
     """Test moving a directory."""
     # Create a directory first
-    auth_client.post(
-        "/api/v1/directories/move_source",
-        headers={"Authorization": f"Bearer {auth_token}"}
-    )
+    make_dir("move_source")
     
     # Move it
     move_data = {"destination": "/moved_dir"}
     response = auth_client.post(
         "/api/v1/directories/move_source/move",
         json=move_data,
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -135,20 +122,17 @@ def test_move_directory(auth_client: TestClient, auth_token: str):
     assert data["path"] == "/moved_dir"
 
 
-def test_copy_directory(auth_client: TestClient, auth_token: str):
+def test_copy_directory(auth_client: TestClient, auth_headers: Dict[str, str], make_dir: Callable):
     """Test copying a directory."""
     # Create a directory first
-    auth_client.post(
-        "/api/v1/directories/copy_source",
-        headers={"Authorization": f"Bearer {auth_token}"}
-    )
+    make_dir("copy_source")
     
     # Copy it
     copy_data = {"destination": "/copied_dir"}
     response = auth_client.post(
         "/api/v1/directories/copy_source/copy",
         json=copy_data,
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
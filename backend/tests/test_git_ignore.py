@@ -1,11 +1,13 @@
 import os
 import shutil
 from pathlib import Path
+from typing import Dict
+
 import pytest
 from fastapi.testclient import TestClient
 from app.config import settings
 
-def test_search_ignores_git_folder(auth_client: TestClient, auth_token: str, temp_vault: Path):
+def test_search_ignores_git_folder(auth_client: TestClient, auth_headers: Dict[str, str], temp_vault: Path):
     """Test that search ignores files inside .git directory."""
     
     # Create a .git directory and a file inside it
@@ -20,7 +22,7 @@ def test_search_ignores_git_folder(auth_client: TestClient, auth_token: str, tem
         response = auth_client.get(
             "/api/v1/notes/search/",
             params={"q": "secret_git_string"},
-            headers={"Authorization": f"Bearer {auth_token}"}
+            headers=auth_headers
         )
         assert response.status_code == 200
         
@@ -38,7 +40,7 @@ def test_search_ignores_git_folder(auth_client: TestClient, auth_token: str, tem
             response = auth_client.get(
                 "/api/v1/notes/search/",
                 params={"q": "secret_git_string"},
-                headers={"Authorization": f"Bearer {auth_token}"}
+                headers=auth_headers
             )
             assert response.status_code == 200
             data = response.json()
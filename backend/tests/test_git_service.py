@@ -1,5 +1,7 @@
 """Tests for git service."""
 
+import os
+import shutil
 import subprocess
 import tempfile
 from pathlib import Path
@@ -7,14 +9,24 @@ from unittest.mock import patch, MagicMock
 
 import pytest
 
+from app.services import git_service as git_service_module
 from app.services.git_service import GitService
 
 
-@pytest.fixture
-def temp_vault() -> Path:
-    """Create a temporary vault directory for testing."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        vault_path = Path(temp_dir) / "test_vault"
+@pytest.fixture(autouse=True)
+def reset_git_environment_cache():
+    """Forget process-wide git probe results so each test starts cold."""
+    git_service_module._safe_directories_configured.clear()
+    git_service_module._git_user_configured = False
+    git_service_module._initialized_vaults.clear()
+    yield
+
+
+@pytest.fixture(scope="session")
+def git_vault_template() -> Path:
+    """Build the reference vault for git service tests once per session."""
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as temp_dir:
+        vault_path = Path(temp_dir) / "template_vault"
         vault_path.mkdir()
         
         # Create some test files
@@ -32,6 +44,17 @@ def temp_vault() -> Path:
         yield vault_path
 
 
+@pytest.fixture
+def temp_vault(git_vault_template: Path) -> Path:
+    """Create a temporary vault directory for testing."""
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as temp_dir:
+        # Tests write files and run git in the vault, so each one gets its own copy
+        vault_path = Path(temp_dir) / "test_vault"
+        shutil.copytree(git_vault_template, vault_path)
+        
+        yield vault_path
+
+
 @pytest.fixture
 def git_service(temp_vault: Path) -> GitService:
     """Create a git service instance with temporary vault."""
@@ -42,26 +65,32 @@ def git_service(temp_vault: Path) -> GitService:
         yield service
 
 
+def git_command(argv: list) -> list:
+    """Strip the config options GitService passes to every git call from a mocked argv."""
+    prefix = ['git', *git_service_module._GIT_CONFIG_ARGS]
+    assert argv[:len(prefix)] == prefix
+    return ['git', *argv[len(prefix):]]
+
+
 class TestGitAvailability:
     """Test git availability detection."""
     
     def test_git_available_when_git_exists(self, git_service: GitService):
-        """Test that git is detected as available when git command works."""
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(returncode=0)
-            assert git_service._is_git_available() is True
+        """Test that git is detected as available when it is on PATH."""
+        with patch.object(git_service_module, '_GIT_EXECUTABLE', '/usr/bin/git'):
+            with patch('subprocess.run') as mock_run:
+                mock_run.return_value = MagicMock(returncode=0)
+                assert git_service._is_git_available() is True
+                # Only safe.directory setup runs; there is no version probe
+                commands = [git_command(call[0][0]) for call in mock_run.call_args_list]
+                assert ['git', '--version'] not in commands
     
     def test_git_unavailable_when_git_not_found(self, git_service: GitService):
-        """Test that git is detected as unavailable when git command fails."""
-        with patch('subprocess.run') as mock_run:
-            mock_run.side_effect = FileNotFoundError()
-            assert git_service._is_git_available() is False
-    
-    def test_git_unavailable_on_timeout(self, git_service: GitService):
-        """Test that git is detected as unavailable on timeout."""
-        with patch('subprocess.run') as mock_run:
-            mock_run.side_effect = subprocess.TimeoutExpired(['git', '--version'], 5)
-            assert git_service._is_git_available() is False
+        """Test that git is detected as unavailable when it is not on PATH."""
+        with patch.object(git_service_module, '_GIT_EXECUTABLE', None):
+            with patch('subprocess.run') as mock_run:
+                assert git_service._is_git_available() is False
+                mock_run.assert_not_called()
 
 
 class TestBinaryFileDetection:
@@ -77,11 +106,35 @@ class TestBinaryFileDetection:
         binary_file = temp_vault / "image.png"
         assert git_service._is_binary_file(binary_file) is True
     
+    def test_utf16_file_with_bom_not_binary(self, git_service: GitService, temp_vault: Path):
+        """Test that UTF-16 text is not mistaken for binary because of its NUL bytes."""
+        utf16_file = temp_vault / "utf16.txt"
+        utf16_file.write_bytes("Hello, world".encode('utf-16'))
+        assert git_service._is_binary_file(utf16_file) is False
+    
+    def test_nul_free_pdf_detected_by_signature(self, git_service: GitService, temp_vault: Path):
+        """Test that a known binary signature is rejected even without NUL bytes."""
+        pdf_file = temp_vault / "doc.pdf"
+        pdf_file.write_bytes(b'%PDF-1.7\n%\xe2\xe3\xcf\xd3\n1 0 obj\n')
+        assert git_service._is_binary_file(pdf_file) is True
+    
+    def test_verdict_cached_until_file_changes(self, git_service: GitService, temp_vault: Path):
+        """Test that an unchanged file is not read again and a rewritten one is."""
+        note = temp_vault / "note1.md"
+        assert git_service._is_binary_file(note) is False
+        
+        with patch('builtins.open', side_effect=AssertionError("file re-read")):
+            assert git_service._is_binary_file(note) is False
+        
+        note.write_bytes(b'\x00binary now')
+        assert git_service._is_binary_file(note) is True
+    
     def test_large_file_detected_as_binary(self, git_service: GitService, temp_vault: Path):
         """Test that files larger than 10MB are detected as binary."""
         large_file = temp_vault / "large.txt"
-        # Create a file larger than 10MB
-        large_file.write_bytes(b'0' * (11 * 1024 * 1024))
+        # Create a file larger than 10MB; only the size matters, so leave it sparse
+        with open(large_file, 'wb') as f:
+            f.truncate(11 * 1024 * 1024)
         assert git_service._is_binary_file(large_file) is True
     
     def test_nonexistent_file_not_binary(self, git_service: GitService, temp_vault: Path):
@@ -93,26 +146,57 @@ class TestBinaryFileDetection:
 class TestGitInitialization:
     """Test git repository initialization."""
     
+    @pytest.fixture(autouse=True)
+    def mock_run(self):
+        """Stub out git subprocesses and report git as available for every test."""
+        with patch('subprocess.run') as mock_run, \
+                patch.object(GitService, '_is_git_available', return_value=True):
+            mock_run.return_value = MagicMock(returncode=0)
+            self.mock_run = mock_run
+            yield mock_run
+    
     def test_initialize_git_when_not_exists(self, git_service: GitService, temp_vault: Path):
         """Test that git is initialized when .git doesn't exist."""
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(returncode=0)
-            with patch.object(git_service, '_is_git_available', return_value=True):
-                result = git_service.initialize_git()
-                assert result is True
-                assert git_service._initialized is True
-                mock_run.assert_called_once()
-                assert mock_run.call_args[0][0] == ['git', 'init']
+        result = git_service.initialize_git()
+        assert result is True
+        assert git_service._initialized is True
+        self.mock_run.assert_called_once()
+        assert git_command(self.mock_run.call_args[0][0]) == ['git', 'init']
     
     def test_initialize_git_when_already_exists(self, git_service: GitService, temp_vault: Path):
         """Test that git initialization is skipped when .git already exists."""
         git_dir = temp_vault / ".git"
         git_dir.mkdir()
+        (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
         
-        with patch.object(git_service, '_is_git_available', return_value=True):
-            result = git_service.initialize_git()
-            assert result is True
-            assert git_service._initialized is True
+        result = git_service.initialize_git()
+        assert result is True
+        assert git_service._initialized is True
+    
+    def test_initialize_git_shared_across_instances(self, git_service: GitService, temp_vault: Path):
+        """Test that a new service for an initialized vault runs no git commands."""
+        git_dir = temp_vault / ".git"
+        git_dir.mkdir()
+        (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+        assert git_service.initialize_git() is True
+        
+        with patch('app.services.git_service.settings') as mock_settings:
+            mock_settings.vault_path = temp_vault
+            other = GitService()
+            other.vault_path = temp_vault
+        self.mock_run.reset_mock()
+        assert other.initialize_git() is True
+        assert other._initialized is True
+        self.mock_run.assert_not_called()
+    
+    def test_initialize_git_runs_in_resolved_vault(self, git_service: GitService, temp_vault: Path):
+        """Test that git runs in the real vault directory when the path is a symlink."""
+        link = temp_vault.parent / "vault-link"
+        link.symlink_to(temp_vault)
+        git_service.vault_path = link
+        
+        assert git_service.initialize_git() is True
+        assert self.mock_run.call_args[1]['cwd'] == str(temp_vault.resolve())
     
     def test_initialize_git_fails_when_git_unavailable(self, git_service: GitService):
         """Test that git initialization fails when git is not available."""
@@ -123,12 +207,27 @@ class TestGitInitialization:
     
     def test_initialize_git_handles_errors(self, git_service: GitService):
         """Test that git initialization handles errors gracefully."""
+        self.mock_run.return_value = MagicMock(returncode=1, stderr="Error message")
+        result = git_service.initialize_git()
+        assert result is False
+        assert git_service._last_error is not None
+
+
+class TestGitUserConfig:
+    """Test git user identity configuration."""
+    
+    def test_sets_only_missing_values_once(self, git_service: GitService):
+        """Test that existing identity settings are kept and the probe runs once per process."""
         with patch('subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(returncode=1, stderr="Error message")
-            with patch.object(git_service, '_is_git_available', return_value=True):
-                result = git_service.initialize_git()
-                assert result is False
-                assert git_service._last_error is not None
+            mock_run.return_value = MagicMock(returncode=0, stdout="user.name Someone\n")
+            assert git_service._configure_git_user() is True
+            commands = [git_command(call[0][0]) for call in mock_run.call_args_list]
+            assert ['git', 'config', '--global', 'user.email', 'kbase@localhost'] in commands
+            assert ['git', 'config', '--global', 'user.name', 'KBase'] not in commands
+            
+            mock_run.reset_mock()
+            assert GitService()._configure_git_user() is True
+            mock_run.assert_not_called()
 
 
 class TestGitignore:
@@ -147,6 +246,7 @@ class TestGitignore:
         assert "_resources/" in content
         assert ".git/" in content
         assert "*.png" in content
+        assert ".*.tmp" in content
     
     def test_ensure_gitignore_updates_existing(self, git_service: GitService, temp_vault: Path):
         """Test that .gitignore is updated if content doesn't match."""
@@ -173,6 +273,16 @@ class TestGitignore:
         
         # Content should be the same
         assert first_content == second_content
+    
+    def test_ensure_gitignore_repairs_later_edits(self, git_service: GitService, temp_vault: Path):
+        """Test that an edit made after a successful check is still reverted."""
+        gitignore_path = temp_vault / ".gitignore"
+        git_service.ensure_gitignore()
+        expected = gitignore_path.read_bytes()
+        
+        gitignore_path.write_text("*.md\n")
+        assert git_service.ensure_gitignore() is True
+        assert gitignore_path.read_bytes() == expected
 
 
 class TestCommitChanges:
@@ -206,18 +316,20 @@ class TestCommitChanges:
                 mock_run.return_value = MagicMock(returncode=0)
                 git_service.initialize_git()
                 
-                # Mock git status (no changes) and diff (no staged changes)
+                # Mock git status (no changes)
                 def run_side_effect(*args, **kwargs):
-                    cmd = args[0] if args else kwargs.get('args', [])
-                    if cmd == ['git', 'status', '--porcelain']:
+                    cmd = git_command(args[0] if args else kwargs.get('args', []))
+                    if cmd == ['git', 'status', '--porcelain=v1', '-z']:
                         return MagicMock(returncode=0, stdout="")
-                    elif cmd == ['git', 'diff', '--cached', '--quiet']:
-                        return MagicMock(returncode=0)
                     return MagicMock(returncode=0)
                 
                 mock_run.side_effect = run_side_effect
                 result = git_service.commit_changes()
                 assert result is True
+                # Nothing was staged or committed
+                commands = [git_command(call[0][0]) for call in mock_run.call_args_list]
+                assert ['git', 'add', '-A'] not in commands
+                assert ['git', 'commit', '-m', 'Auto-commit'] not in commands
     
     def test_commit_changes_stages_text_files(self, git_service: GitService, temp_vault: Path):
         """Test that commit stages text files but not binary files."""
@@ -228,18 +340,16 @@ class TestCommitChanges:
                 git_service.initialize_git()
                 
                 # Mock git status (has changes) and operations
-                call_count = 0
+                add_calls = 0
                 def run_side_effect(*args, **kwargs):
-                    nonlocal call_count
-                    cmd = args[0] if args else kwargs.get('args', [])
-                    call_count += 1
+                    nonlocal add_calls
+                    cmd = git_command(args[0] if args else kwargs.get('args', []))
                     
-                    if cmd == ['git', 'status', '--porcelain']:
-                        return MagicMock(returncode=0, stdout="note1.md\n")
-                    elif cmd == ['git', 'add', '.']:
+                    if cmd == ['git', 'status', '--porcelain=v1', '-z']:
+                        return MagicMock(returncode=0, stdout="?? note1.md\0")
+                    elif cmd == ['git', 'add', '-A']:
+                        add_calls += 1
                         return MagicMock(returncode=0)
-                    elif cmd == ['git', 'diff', '--cached', '--quiet']:
-                        return MagicMock(returncode=1)  # Has staged changes
                     elif cmd == ['git', 'commit', '-m', 'Auto-commit']:
                         return MagicMock(returncode=0)
                     return MagicMock(returncode=0)
@@ -248,9 +358,7 @@ class TestCommitChanges:
                 result = git_service.commit_changes()
                 assert result is True
                 # Verify git add was called
-                add_calls = [call for call in mock_run.call_args_list 
-                           if len(call[0]) > 0 and call[0][0] == ['git', 'add', '.']]
-                assert len(add_calls) > 0
+                assert add_calls > 0
     
     def test_commit_changes_handles_errors(self, git_service: GitService):
         """Test that commit handles errors gracefully."""
@@ -295,3 +403,174 @@ class TestGetStatus:
         assert status["last_error"] == "Test error"
         assert status["last_error_time"] == 1234567890.0
 
+
+def run_git(vault: Path, *args: str) -> str:
+    """Run a real git command in the vault with a fixed test identity."""
+    env = {**os.environ, 'GIT_AUTHOR_NAME': 'Test', 'GIT_AUTHOR_EMAIL': 'test@localhost',
+           'GIT_COMMITTER_NAME': 'Test', 'GIT_COMMITTER_EMAIL': 'test@localhost'}
+    return subprocess.run(['git', *args], cwd=vault, env=env, check=True,
+                          capture_output=True, text=True).stdout.strip()
+
+
+@pytest.mark.skipif(shutil.which('git') is None, reason="git is not installed")
+class TestCommitSingleFile:
+    """Test committing one file at a time."""
+    
+    def test_commits_only_the_given_file(self, git_service: GitService, temp_vault: Path):
+        """Test that the commit covers just the file and a repeat is a successful no-op."""
+        run_git(temp_vault, 'init', '-q')
+        git_service._initialized = True
+        
+        assert git_service.commit_single_file("/note1.md") is True
+        assert run_git(temp_vault, 'log', '--format=%s') == "Auto-commit: note1.md"
+        assert run_git(temp_vault, 'ls-files') == "note1.md"
+        
+        assert git_service.commit_single_file("note1.md") is True
+        assert run_git(temp_vault, 'rev-list', '--count', 'HEAD') == "1"
+
+
+@pytest.mark.skipif(shutil.which('git') is None, reason="git is not installed")
+class TestGitConfig:
+    """Test config applied to every git call."""
+    
+    def test_automatic_gc_disabled(self, git_service: GitService, temp_vault: Path):
+        """Test that git calls see gc.auto=0 and an explicit collection still runs."""
+        run_git(temp_vault, 'init', '-q')
+        git_service._initialized = True
+        
+        assert git_service._run_git(['config', 'gc.auto']).stdout.strip() == "0"
+        assert git_service._run_git(['config', 'core.untrackedCache']).stdout.strip() == "true"
+        assert git_service.collect_garbage() is True
+
+
+@pytest.mark.skipif(shutil.which('git') is None, reason="git is not installed")
+class TestFileContentAtCommit:
+    """Test reading file content from history."""
+    
+    def test_reads_each_revision(self, git_service: GitService, temp_vault: Path):
+        """Test that successive lookups through the shared process return the right blobs."""
+        run_git(temp_vault, 'init', '-q')
+        run_git(temp_vault, 'add', 'note1.md')
+        run_git(temp_vault, 'commit', '-q', '-m', 'first')
+        first = run_git(temp_vault, 'rev-parse', 'HEAD')
+        (temp_vault / "note1.md").write_text("second version\n")
+        run_git(temp_vault, 'commit', '-q', '-am', 'second')
+        second = run_git(temp_vault, 'rev-parse', 'HEAD')
+        git_service._initialized = True
+        
+        try:
+            assert git_service.get_file_content_at_commit("note1.md", first) == "# Test Note 1\n\nThis is a test note."
+            assert git_service.get_file_content_at_commit("/note1.md", second) == "second version\n"
+            with pytest.raises(ValueError, match="File not found in commit"):
+                git_service.get_file_content_at_commit("note2.md", first)
+            # The process survives a miss
+            assert git_service.get_file_content_at_commit("note1.md", second) == "second version\n"
+        finally:
+            git_service.close()
+
+
+@pytest.mark.skipif(shutil.which('git') is None, reason="git is not installed")
+class TestHistoryCache:
+    """Test memoization of history lookups."""
+    
+    def test_history_cached_until_head_moves(self, git_service: GitService, temp_vault: Path):
+        """Test that repeat lookups skip git and a commit made outside the service is seen."""
+        run_git(temp_vault, 'init', '-q')
+        run_git(temp_vault, 'add', 'note1.md')
+        run_git(temp_vault, 'commit', '-q', '-m', 'first')
+        git_service._initialized = True
+        
+        first = git_service.get_file_commits("note1.md")
+        current = git_service.get_current_commit_for_file("note1.md")
+        assert current == first[0]["hash"]
+        
+        with patch('subprocess.run') as mock_run:
+            assert git_service.get_file_commits("note1.md") == first
+            assert git_service.get_current_commit_for_file("note1.md") == current
+            mock_run.assert_not_called()
+        
+        (temp_vault / "note1.md").write_text("second version\n")
+        assert git_service.get_current_commit_for_file("note1.md") is None
+        run_git(temp_vault, 'commit', '-q', '-am', 'second')
+        
+        commits = git_service.get_file_commits("note1.md")
+        assert [c["message"] for c in commits] == ["second", "first"]
+        assert git_service.get_current_commit_for_file("note1.md") == commits[0]["hash"]
+    
+    def test_history_limit(self, git_service: GitService, temp_vault: Path):
+        """Test that a limit returns only the newest commits."""
+        run_git(temp_vault, 'init', '-q')
+        run_git(temp_vault, 'add', 'note1.md')
+        run_git(temp_vault, 'commit', '-q', '-m', 'first')
+        (temp_vault / "note1.md").write_text("second version\n")
+        run_git(temp_vault, 'commit', '-q', '-am', 'second')
+        git_service._initialized = True
+        
+        assert [c["message"] for c in git_service.get_file_commits("note1.md", limit=1)] == ["second"]
+        assert len(git_service.get_file_commits("note1.md")) == 2
+        assert git_service.get_file_commits("note2.md") == []
+    
+    def test_history_follows_renames_on_request(self, git_service: GitService, temp_vault: Path):
+        """Test that commits from before a rename are only listed with follow."""
+        run_git(temp_vault, 'init', '-q')
+        run_git(temp_vault, 'add', 'note1.md')
+        run_git(temp_vault, 'commit', '-q', '-m', 'first')
+        run_git(temp_vault, 'mv', 'note1.md', 'renamed.md')
+        run_git(temp_vault, 'commit', '-q', '-m', 'rename')
+        git_service._initialized = True
+        
+        assert [c["message"] for c in git_service.get_file_commits("renamed.md")] == ["rename"]
+        commits = git_service.get_file_commits("renamed.md", limit=None, follow=True)
+        assert [c["message"] for c in commits] == ["rename", "first"]
+
+
+def fake_git_log(script: str):
+    """Make _popen_git run a shell script in place of `git log`."""
+    def popen(self, args, stderr):
+        return subprocess.Popen(['sh', '-c', script], stdout=subprocess.PIPE, stderr=stderr, text=True)
+    return patch.object(GitService, '_popen_git', popen)
+
+
+@pytest.mark.skipif(shutil.which('sh') is None, reason="sh is not installed")
+class TestFileCommitsStreaming:
+    """Test the streamed `git log` behind get_file_commits."""
+    
+    def test_large_stderr_does_not_block(self, git_service: GitService):
+        """Test that more error output than a pipe buffer holds still fails cleanly."""
+        git_service._initialized = True
+        with patch.object(git_service, '_is_git_available', return_value=True), \
+                fake_git_log("head -c 1000000 /dev/zero | tr '\\0' w >&2; exit 1"):
+            with pytest.raises(ValueError, match="Git log failed"):
+                git_service.get_file_commits("note1.md")
+    
+    def test_slow_log_is_killed(self, git_service: GitService):
+        """Test that a walk outliving the timeout is abandoned."""
+        git_service._initialized = True
+        with patch.object(git_service, '_is_git_available', return_value=True), \
+                patch.object(git_service_module, '_GIT_LOG_TIMEOUT', 0.2), \
+                fake_git_log("echo 'abc|1|first'; exec sleep 30"):
+            with pytest.raises(ValueError, match="timed out"):
+                git_service.get_file_commits("note1.md")
+
+
+@pytest.mark.skipif(shutil.which('git') is None, reason="git is not installed")
+class TestFileCommitsBulk:
+    """Test fetching history for several files at once."""
+    
+    def test_maps_commits_to_files(self, git_service: GitService, temp_vault: Path):
+        """Test that one log call attributes each commit to the files it touched."""
+        run_git(temp_vault, 'init', '-q')
+        run_git(temp_vault, 'add', 'note1.md', 'note2.md')
+        run_git(temp_vault, 'commit', '-q', '-m', 'both')
+        (temp_vault / "note2.md").write_text("changed")
+        run_git(temp_vault, 'commit', '-q', '-am', 'only | note2')
+        git_service._initialized = True
+        
+        with patch('subprocess.run', wraps=subprocess.run) as mock_run:
+            history = git_service.get_file_commits_bulk(["note1.md", "/note2.md"])
+            log_calls = [call for call in mock_run.call_args_list if 'log' in call[0][0]]
+            assert len(log_calls) == 1
+        
+        assert [c["message"] for c in history["note1.md"]] == ["both"]
+        assert [c["message"] for c in history["/note2.md"]] == ["only | note2", "both"]
+        assert history["/note2.md"][1]["hash"] == history["note1.md"][0]["hash"]
@@ -1,6 +1,9 @@
 """Tests for image upload API endpoints and ImageService."""
 
 import io
+import shutil
+from typing import Dict
+
 import pytest
 from pathlib import Path
 from fastapi.testclient import TestClient
@@ -113,6 +116,46 @@ class TestImageService:
         with pytest.raises(ValueError, match="File too large"):
             service.upload_image(upload_file)
 
+    def test_upload_image_too_large_without_declared_size(self, temp_vault):
+        """Test that the size limit holds while streaming when no size is declared."""
+        service = ImageService()
+        service.vault_path = temp_vault
+
+        large_data = b'x' * (service.MAX_FILE_SIZE + 1)
+
+        class MockUploadFile:
+            def __init__(self, filename, file, content_type):
+                self.filename = filename
+                self.file = file
+                self.content_type = content_type
+                self.size = None
+
+        upload_file = MockUploadFile('large.png', io.BytesIO(large_data), 'image/png')
+
+        with pytest.raises(ValueError, match="File too large"):
+            service.upload_image(upload_file)
+
+        # The partial upload was removed
+        assert list((temp_vault / '_resources').iterdir()) == []
+
+    def test_upload_image_recreates_removed_resources_directory(self, temp_vault):
+        """Test that uploads still work after _resources is deleted."""
+        service = ImageService()
+        service.vault_path = temp_vault
+
+        class MockUploadFile:
+            def __init__(self, filename, file, content_type):
+                self.filename = filename
+                self.file = file
+                self.content_type = content_type
+                self.size = len(file.getvalue())
+
+        service.upload_image(MockUploadFile('a.png', io.BytesIO(b'\x89PNG'), 'image/png'))
+        shutil.rmtree(temp_vault / '_resources')
+
+        result_path = service.upload_image(MockUploadFile('b.png', io.BytesIO(b'\x89PNG'), 'image/png'))
+        assert (temp_vault / result_path.lstrip('/')).exists()
+
     def test_upload_image_creates_resources_directory(self, temp_vault):
         """Test that _resources directory is created if it doesn't exist."""
         service = ImageService()
@@ -147,7 +190,7 @@ class TestImageService:
 class TestImageAPI:
     """Test the image upload API endpoints."""
 
-    def test_upload_image_success(self, auth_client: TestClient, auth_token: str, temp_vault):
+    def test_upload_image_success(self, auth_client: TestClient, auth_headers: Dict[str, str], temp_vault):
         """Test successful image upload via API."""
         # Create a test image
         img = Image.new('RGB', (100, 100), color='red')
@@ -159,7 +202,7 @@ class TestImageAPI:
         response = auth_client.post(
             "/api/v1/images/upload",
             files={"file": ("test.png", img_bytes.getvalue(), "image/png")},
-            headers={"Authorization": f"Bearer {auth_token}"}
+            headers=auth_headers
         )
 
         assert response.status_code == 200
@@ -172,18 +215,18 @@ class TestImageAPI:
         resources_dir = temp_vault / '_resources'
         assert (resources_dir / 'test.png').exists()
 
-    def test_upload_image_invalid_file_type(self, auth_client: TestClient, auth_token: str):
+    def test_upload_image_invalid_file_type(self, auth_client: TestClient, auth_headers: Dict[str, str]):
         """Test uploading invalid file type via API."""
         response = auth_client.post(
             "/api/v1/images/upload",
             files={"file": ("test.txt", b"not an image", "text/plain")},
-            headers={"Authorization": f"Bearer {auth_token}"}
+            headers=auth_headers
         )
 
         assert response.status_code == 400
         assert "Unsupported file type" in response.json()["detail"]
 
-    def test_upload_image_too_large(self, auth_client: TestClient, auth_token: str):
+    def test_upload_image_too_large(self, auth_client: TestClient, auth_headers: Dict[str, str]):
         """Test uploading file that's too large via API."""
         # Create a file larger than MAX_FILE_SIZE
         large_content = b'x' * (10 * 1024 * 1024 + 1)  # 10MB + 1 byte
@@ -191,7 +234,7 @@ class TestImageAPI:
         response = auth_client.post(
             "/api/v1/images/upload",
             files={"file": ("large.png", large_content, "image/png")},
-            headers={"Authorization": f"Bearer {auth_token}"}
+            headers=auth_headers
         )
 
         assert response.status_code == 400
@@ -211,7 +254,7 @@ class TestImageAPI:
 
         assert response.status_code == 401
 
-    def test_upload_image_creates_unique_filename(self, auth_client: TestClient, auth_token: str, temp_vault):
+    def test_upload_image_creates_unique_filename(self, auth_client: TestClient, auth_headers: Dict[str, str], temp_vault):
         """Test that uploading multiple files with same name creates unique filenames."""
         # Create two identical images
         img = Image.new('RGB', (50, 50), color='yellow')
@@ -226,14 +269,14 @@ class TestImageAPI:
         response1 = auth_client.post(
             "/api/v1/images/upload",
             files={"file": ("test.png", img_bytes1.getvalue(), "image/png")},
-            headers={"Authorization": f"Bearer {auth_token}"}
+            headers=auth_headers
         )
 
         # Upload second image with same name
         response2 = auth_client.post(
             "/api/v1/images/upload",
             files={"file": ("test.png", img_bytes2.getvalue(), "image/png")},
-            headers={"Authorization": f"Bearer {auth_token}"}
+            headers=auth_headers
         )
 
         assert response1.status_code == 200
@@ -242,7 +285,7 @@ class TestImageAPI:
         path1 = response1.json()["path"]
         path2 = response2.json()["path"]
 
-        # Paths should be different (UUID-based filenames)
+        # Paths should be different (random filenames)
         assert path1 != path2
         assert path1.endswith('.png')
         assert path2.endswith('.png')
@@ -1,14 +1,20 @@
 """Tests for notes API endpoints with authentication."""
 
+import os
+from typing import Dict
+from unittest.mock import patch
+
 import pytest
 from fastapi.testclient import TestClient
 
+from app.services.file_service import FileService
+
 
-def test_list_notes(auth_client: TestClient, auth_token: str):
+def test_list_notes(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test listing all notes."""
     response = auth_client.get(
         "/api/v1/notes/",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -30,11 +36,11 @@ def test_list_notes(auth_client: TestClient, auth_token: str):
     assert subdir["children"][0]["name"] == "note3.md"
 
 
-def test_get_note(auth_client: TestClient, auth_token: str):
+def test_get_note(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test getting a note by path."""
     response = auth_client.get(
         "/api/v1/notes/note1.md",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -45,11 +51,34 @@ def test_get_note(auth_client: TestClient, auth_token: str):
     assert "modified" in data
 
 
-def test_get_note_nested(auth_client: TestClient, auth_token: str):
+def test_get_note_replaced_after_validation(auth_client: TestClient, auth_headers: Dict[str, str], temp_vault):
+    """Test that a note swapped for a longer one mid-request is read in full."""
+    replacement = "# Replaced\n\n" + "much longer content " * 500
+    original_check = FileService._is_binary_file
+    
+    def replace_then_check(self, file_path, stat):
+        # Runs after validation stats the note and before it is opened
+        (temp_vault / "replacement.tmp").write_text(replacement)
+        os.replace(temp_vault / "replacement.tmp", temp_vault / "note1.md")
+        return original_check(self, file_path, stat)
+    
+    with patch.object(FileService, '_is_binary_file', replace_then_check):
+        response = auth_client.get(
+            "/api/v1/notes/note1.md",
+            headers=auth_headers
+        )
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert data["content"] == replacement
+    assert data["size"] == len(replacement)
+
+
+def test_get_note_nested(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test getting a nested note."""
     response = auth_client.get(
         "/api/v1/notes/subdir/note3.md",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -58,23 +87,33 @@ def test_get_note_nested(auth_client: TestClient, auth_token: str):
     assert data["path"] == "/subdir/note3.md"
 
 
-def test_get_note_not_found(auth_client: TestClient, auth_token: str):
+def test_get_note_not_found(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test getting a non-existent note."""
     response = auth_client.get(
         "/api/v1/notes/nonexistent.md",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 404
     assert "Note not found" in response.json()["detail"]
 
 
-def test_create_note(auth_client: TestClient, auth_token: str):
+def test_get_note_below_a_file_not_found(auth_client: TestClient, auth_headers: Dict[str, str]):
+    """Test that a path continuing below an existing file is reported as missing."""
+    response = auth_client.get(
+        "/api/v1/notes/note1.md/child.md",
+        headers=auth_headers
+    )
+    assert response.status_code == 404
+    assert "Note not found" in response.json()["detail"]
+
+
+def test_create_note(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test creating a new note."""
     note_data = {"content": "# New Note\n\nThis is a new note."}
     response = auth_client.post(
         "/api/v1/notes/new_note.md",
         json=note_data,
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -85,44 +124,82 @@ def test_create_note(auth_client: TestClient, auth_token: str):
     # Verify the note was actually created
     get_response = auth_client.get(
         "/api/v1/notes/new_note.md",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert get_response.status_code == 200
     assert get_response.json()["content"] == note_data["content"]
 
 
-def test_create_note_nested(auth_client: TestClient, auth_token: str):
+def test_create_note_nested(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test creating a note in a nested directory."""
     note_data = {"content": "# Nested New Note\n\nThis is a nested note."}
     response = auth_client.post(
         "/api/v1/notes/nested/new_note.md",
         json=note_data,
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
     # Verify the note was created
     get_response = auth_client.get(
         "/api/v1/notes/nested/new_note.md",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert get_response.status_code == 200
     assert get_response.json()["content"] == note_data["content"]
 
 
-def test_create_note_already_exists(auth_client: TestClient, auth_token: str):
+def test_create_note_already_exists(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test creating a note that already exists."""
     note_data = {"content": "# Duplicate Note\n\nThis should fail."}
     response = auth_client.post(
         "/api/v1/notes/note1.md",
         json=note_data,
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
+    )
+    assert response.status_code == 409
+    assert "already exists" in response.json()["detail"]
+
+
+def test_move_note_destination_exists(auth_client: TestClient, auth_headers: Dict[str, str], temp_vault):
+    """Test that moving a note onto an existing note fails without overwriting it."""
+    response = auth_client.post(
+        "/api/v1/notes/note1.md/move",
+        json={"destination": "note2.md"},
+        headers=auth_headers
     )
     assert response.status_code == 409
     assert "already exists" in response.json()["detail"]
 
+    # Both notes should be untouched
+    assert (temp_vault / "note1.md").read_text() == "# Test Note 1\n\nThis is a test note."
+    assert (temp_vault / "note2.md").read_text() == "# Test Note 2\n\nAnother test note."
 
-def test_update_note(auth_client: TestClient, auth_token: str):
+
+def test_copy_note(auth_client: TestClient, auth_headers: Dict[str, str], temp_vault):
+    """Test copying a note preserves content and the source note."""
+    response = auth_client.post(
+        "/api/v1/notes/note1.md/copy",
+        json={"destination": "copies/note1_copy.md"},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["path"] == "/copies/note1_copy.md"
+
+    copied = temp_vault / "copies" / "note1_copy.md"
+    assert copied.read_text() == (temp_vault / "note1.md").read_text()
+    assert int(copied.stat().st_mtime) == int((temp_vault / "note1.md").stat().st_mtime)
+
+    # Copying onto an existing note is rejected
+    response = auth_client.post(
+        "/api/v1/notes/note1.md/copy",
+        json={"destination": "note2.md"},
+        headers=auth_headers
+    )
+    assert response.status_code == 409
+
+
+def test_update_note(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test updating an existing note."""
     new_content = "# Updated Note 1\n\nThis note has been updated."
     note_data = {"content": new_content}
@@ -130,7 +207,7 @@ def test_update_note(auth_client: TestClient, auth_token: str):
     response = auth_client.put(
         "/api/v1/notes/note1.md",
         json=note_data,
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -141,17 +218,63 @@ def test_update_note(auth_client: TestClient, auth_token: str):
     # Verify the note was actually updated
     get_response = auth_client.get(
         "/api/v1/notes/note1.md",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert get_response.status_code == 200
     assert get_response.json()["content"] == new_content
 
 
-def test_delete_note(auth_client: TestClient, auth_token: str):
+def test_update_note_keeps_permissions(auth_client: TestClient, auth_headers: Dict[str, str], temp_vault):
+    """Test that updating a note keeps its mode and leaves no temporary files."""
+    note = temp_vault / "note1.md"
+    os.chmod(note, 0o600)
+
+    response = auth_client.put(
+        "/api/v1/notes/note1.md",
+        json={"content": "# Rewritten"},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+
+    assert note.read_text() == "# Rewritten"
+    assert note.stat().st_mode & 0o777 == 0o600
+    assert not [p for p in temp_vault.iterdir() if p.name.endswith(".tmp")]
+
+
+def test_leftover_temp_files_do_not_block_writes(auth_client: TestClient, auth_headers: Dict[str, str], temp_vault):
+    """Test that temporary files left by a crashed write don't break later saves."""
+    stale = [
+        temp_vault / f".note1.md.{os.getpid()}.tmp",
+        temp_vault / f".fresh.md.{os.getpid()}.tmp",
+    ]
+    for path in stale:
+        path.write_text("partial")
+
+    response = auth_client.put(
+        "/api/v1/notes/note1.md",
+        json={"content": "# Saved"},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert (temp_vault / "note1.md").read_text() == "# Saved"
+
+    response = auth_client.post(
+        "/api/v1/notes/fresh.md",
+        json={"content": "# Fresh"},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert (temp_vault / "fresh.md").read_text() == "# Fresh"
+
+    temp_files = {p for p in temp_vault.iterdir() if p.name.endswith(".tmp")}
+    assert temp_files == set(stale)
+
+
+def test_delete_note(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test deleting a note."""
     response = auth_client.delete(
         "/api/v1/notes/note2.md",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -162,12 +285,12 @@ def test_delete_note(auth_client: TestClient, auth_token: str):
     # Verify the note was actually deleted
     get_response = auth_client.get(
         "/api/v1/notes/note2.md",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert get_response.status_code == 404
 
 
-def test_update_note_with_leading_slash(auth_client: TestClient, auth_token: str):
+def test_update_note_with_leading_slash(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test that paths with leading slashes are normalized correctly.
     
     This test validates the fix for the double-slash bug where paths like
@@ -180,7 +303,7 @@ def test_update_note_with_leading_slash(auth_client: TestClient, auth_token: str
     response = auth_client.put(
         "/api/v1/notes/%2Fnote1.md",  # URL-encoded /note1.md
         json=note_data,
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -193,7 +316,7 @@ def test_update_note_with_leading_slash(auth_client: TestClient, auth_token: str
     # Verify by reading the note back
     get_response = auth_client.get(
         "/api/v1/notes/%2Fnote1.md",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert get_response.status_code == 200
     get_data = get_response.json()
@@ -217,7 +340,7 @@ def test_notes_without_auth_fail(auth_client: TestClient):
     assert response.status_code == 403
 
 
-def test_list_notes_includes_empty_directories(auth_client: TestClient, auth_token: str, temp_vault):
+def test_list_notes_includes_empty_directories(auth_client: TestClient, auth_headers: Dict[str, str], temp_vault):
     """Test that list_notes includes empty directories in the file tree.
     
     This is a regression test to ensure empty directories are not filtered out.
@@ -235,7 +358,7 @@ def test_list_notes_includes_empty_directories(auth_client: TestClient, auth_tok
     # Get the file tree
     response = auth_client.get(
         "/api/v1/notes/",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -261,11 +384,11 @@ def test_list_notes_includes_empty_directories(auth_client: TestClient, auth_tok
     assert parent_folder["children"][0]["type"] == "directory"
 
 
-def test_file_tree_includes_timestamps(auth_client: TestClient, auth_token: str):
+def test_file_tree_includes_timestamps(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test that file tree includes created and modified timestamps."""
     response = auth_client.get(
         "/api/v1/notes/",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -305,11 +428,11 @@ def test_file_tree_includes_timestamps(auth_client: TestClient, auth_token: str)
             assert dir_node["modified"] > 0, f"Directory {dir_node['name']} modified timestamp should be positive"
 
 
-def test_nested_file_tree_timestamps(auth_client: TestClient, auth_token: str):
+def test_nested_file_tree_timestamps(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test that nested files and directories also have timestamps."""
     response = auth_client.get(
         "/api/v1/notes/",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -333,3 +456,102 @@ def test_nested_file_tree_timestamps(auth_client: TestClient, auth_token: str):
             assert isinstance(child["modified"], int)
             assert child["created"] > 0
             assert child["modified"] > 0
+
+
+def test_list_notes_stream_matches_tree(auth_client: TestClient, auth_headers: Dict[str, str], temp_vault):
+    """Test that the streamed tree is the same document as the regular listing."""
+    (temp_vault / "subdir" / "deeper").mkdir()
+    (temp_vault / "subdir" / "deeper" / "leaf.md").write_text("# Leaf")
+
+    tree = auth_client.get("/api/v1/notes/", headers=auth_headers)
+    streamed = auth_client.get("/api/v1/notes/", params={"stream": "true"}, headers=auth_headers)
+    assert streamed.status_code == 200
+    assert streamed.headers["content-type"] == "application/json"
+    assert streamed.json() == tree.json()
+
+
+def test_file_tree_reflects_changes_between_listings(auth_client: TestClient, auth_headers: Dict[str, str], temp_vault):
+    """Test that repeated listings pick up filesystem and API changes."""
+    os.utime(temp_vault / "note1.md", (1000, 1000))
+
+    data = auth_client.get("/api/v1/notes/", headers=auth_headers).json()
+    note1 = next(child for child in data["children"] if child["name"] == "note1.md")
+    assert note1["modified"] == 1000
+
+    # A file added outside the API shows up in the nested directory
+    (temp_vault / "subdir" / "external.md").write_text("# External")
+
+    # Updating a note through the API refreshes its timestamp
+    response = auth_client.put(
+        "/api/v1/notes/note1.md",
+        json={"content": "# Updated"},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+
+    data = auth_client.get("/api/v1/notes/", headers=auth_headers).json()
+    note1 = next(child for child in data["children"] if child["name"] == "note1.md")
+    assert note1["modified"] == int((temp_vault / "note1.md").stat().st_mtime)
+    subdir = next(child for child in data["children"] if child["name"] == "subdir")
+    assert [child["name"] for child in subdir["children"]] == ["external.md", "note3.md"]
+
+
+def test_file_tree_reflects_in_place_edits(auth_client: TestClient, auth_headers: Dict[str, str], temp_vault):
+    """Test that editing a file outside the API updates it in the next listing."""
+    # Old directory mtimes, so the listings are cached
+    for directory in (temp_vault, temp_vault / "subdir"):
+        os.utime(directory, (1000, 1000))
+    auth_client.get("/api/v1/notes/", headers=auth_headers)
+    
+    # Rewriting a file in place leaves the directory mtime alone
+    os.utime(temp_vault / "subdir" / "note3.md", (2000, 2000))
+    
+    data = auth_client.get("/api/v1/notes/", headers=auth_headers).json()
+    subdir = next(child for child in data["children"] if child["name"] == "subdir")
+    assert subdir["children"][0]["modified"] == 2000
+
+
+def test_file_tree_reflects_changes_in_same_tick(auth_client: TestClient, auth_headers: Dict[str, str], temp_vault):
+    """Test that an entry added without changing the directory mtime is still listed."""
+    # A directory changed just before the listing
+    subdir = temp_vault / "subdir"
+    os.utime(subdir)
+    mtime_ns = subdir.stat().st_mtime_ns
+    auth_client.get("/api/v1/notes/", headers=auth_headers)
+    
+    # On a coarse-timestamp filesystem the mtime may not move
+    (subdir / "same_tick.md").write_text("# Same tick")
+    os.utime(subdir, ns=(mtime_ns, mtime_ns))
+    
+    data = auth_client.get("/api/v1/notes/", headers=auth_headers).json()
+    subdir_node = next(child for child in data["children"] if child["name"] == "subdir")
+    assert [child["name"] for child in subdir_node["children"]] == ["note3.md", "same_tick.md"]
+
+
+def test_file_tree_stops_at_symlink_cycles(auth_client: TestClient, auth_headers: Dict[str, str], temp_vault):
+    """Test that a directory symlink back to an ancestor is listed without children."""
+    (temp_vault / "subdir" / "loop").symlink_to(temp_vault, target_is_directory=True)
+    
+    tree = auth_client.get("/api/v1/notes/", headers=auth_headers)
+    assert tree.status_code == 200
+    subdir = next(child for child in tree.json()["children"] if child["name"] == "subdir")
+    loop = next(child for child in subdir["children"] if child["name"] == "loop")
+    assert loop["children"] == []
+    
+    streamed = auth_client.get("/api/v1/notes/", params={"stream": "true"}, headers=auth_headers)
+    assert streamed.json() == tree.json()
+
+
+def test_get_note_through_symlink_outside_vault(auth_client: TestClient, auth_headers: Dict[str, str], temp_vault):
+    """Test that a symlink inside the vault can't be used to read files outside it."""
+    outside = temp_vault.parent / "outside"
+    outside.mkdir()
+    (outside / "secret.md").write_text("# Secret")
+    (temp_vault / "escape").symlink_to(outside, target_is_directory=True)
+
+    response = auth_client.get(
+        "/api/v1/notes/escape/secret.md",
+        headers=auth_headers
+    )
+    assert response.status_code == 400
+    assert "Path traversal detected" in response.json()["detail"]
@@ -1,14 +1,16 @@
 """Tests for notes API endpoints with authentication."""
 
+from typing import Dict
+
 import pytest
 from fastapi.testclient import TestClient
 
 
-def test_list_notes(auth_client: TestClient, auth_token: str):
+def test_list_notes(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test listing all notes."""
     response = auth_client.get(
         "/api/v1/notes/",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -30,11 +32,11 @@ def test_list_notes(auth_client: TestClient, auth_token: str):
     assert subdir["children"][0]["name"] == "note3.md"
 
 
-def test_get_note(auth_client: TestClient, auth_token: str):
+def test_get_note(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test getting a note by path."""
     response = auth_client.get(
         "/api/v1/notes/note1.md",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -45,11 +47,11 @@ def test_get_note(auth_client: TestClient, auth_token: str):
     assert "modified" in data
 
 
-def test_get_note_nested(auth_client: TestClient, auth_token: str):
+def test_get_note_nested(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test getting a nested note."""
     response = auth_client.get(
         "/api/v1/notes/subdir/note3.md",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -58,23 +60,23 @@ def test_get_note_nested(auth_client: TestClient, auth_token: str):
     assert data["path"] == "/subdir/note3.md"
 
 
-def test_get_note_not_found(auth_client: TestClient, auth_token: str):
+def test_get_note_not_found(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test getting a non-existent note."""
     response = auth_client.get(
         "/api/v1/notes/nonexistent.md",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 404
     assert "Note not found" in response.json()["detail"]
 
 
-def test_create_note(auth_client: TestClient, auth_token: str):
+def test_create_note(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test creating a new note."""
     note_data = {"content": "# New Note\n\nThis is a new note."}
     response = auth_client.post(
         "/api/v1/notes/new_note.md",
         json=note_data,
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -85,44 +87,44 @@ def test_create_note(auth_client: TestClient, auth_token: str):
     # Verify the note was actually created
     get_response = auth_client.get(
         "/api/v1/notes/new_note.md",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert get_response.status_code == 200
     assert get_response.json()["content"] == note_data["content"]
 
 
-def test_create_note_nested(auth_client: TestClient, auth_token: str):
+def test_create_note_nested(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test creating a note in a nested directory."""
     note_data = {"content": "# Nested New Note\n\nThis is a nested note."}
     response = auth_client.post(
         "/api/v1/notes/nested/new_note.md",
         json=note_data,
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
     # Verify the note was created
     get_response = auth_client.get(
         "/api/v1/notes/nested/new_note.md",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert get_response.status_code == 200
     assert get_response.json()["content"] == note_data["content"]
 
 
-def test_create_note_already_exists(auth_client: TestClient, auth_token: str):
+def test_create_note_already_exists(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test creating a note that already exists."""
     note_data = {"content": "# Duplicate Note\n\nThis should fail."}
     response = auth_client.post(
         "/api/v1/notes/note1.md",
         json=note_data,
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 409
     assert "already exists" in response.json()["detail"]
 
 
-def test_update_note(auth_client: TestClient, auth_token: str):
+def test_update_note(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test updating an existing note."""
     new_content = "# Updated Note 1\n\nThis note has been updated."
     note_data = {"content": new_content}
@@ -130,7 +132,7 @@ def test_update_note(auth_client: TestClient, auth_token: str):
     response = auth_client.put(
         "/api/v1/notes/note1.md",
         json=note_data,
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -141,17 +143,17 @@ def test_update_note(auth_client: TestClient, auth_token: str):
     # Verify the note was actually updated
     get_response = auth_client.get(
         "/api/v1/notes/note1.md",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert get_response.status_code == 200
     assert get_response.json()["content"] == new_content
 
 
-def test_delete_note(auth_client: TestClient, auth_token: str):
+def test_delete_note(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test deleting a note."""
     response = auth_client.delete(
         "/api/v1/notes/note2.md",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -162,7 +164,7 @@ def test_delete_note(auth_client: TestClient, auth_token: str):
     # Verify the note was actually deleted
     get_response = auth_client.get(
         "/api/v1/notes/note2.md",
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert get_response.status_code == 404
 
@@ -1,15 +1,17 @@
 """Tests for search API endpoint with snippets."""
 
+from typing import Dict
+
 import pytest
 from fastapi.testclient import TestClient
 
 
-def test_search_notes_basic(auth_client: TestClient, auth_token: str):
+def test_search_notes_basic(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test basic search functionality."""
     response = auth_client.get(
         "/api/v1/notes/search/",
         params={"q": "test"},
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -20,12 +22,12 @@ def test_search_notes_basic(auth_client: TestClient, auth_token: str):
     assert isinstance(data["total"], int)
 
 
-def test_search_notes_with_snippets(auth_client: TestClient, auth_token: str):
+def test_search_notes_with_snippets(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test search returns snippets with line numbers."""
     response = auth_client.get(
         "/api/v1/notes/search/",
         params={"q": "test"},
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -48,12 +50,12 @@ def test_search_notes_with_snippets(auth_client: TestClient, auth_token: str):
             assert snippet["line_number"] > 0
 
 
-def test_search_notes_limit_snippets(auth_client: TestClient, auth_token: str):
+def test_search_notes_limit_snippets(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test that search limits to 3 snippets per file."""
     response = auth_client.get(
         "/api/v1/notes/search/",
         params={"q": "note"},  # Common word that might appear multiple times
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -63,12 +65,12 @@ def test_search_notes_limit_snippets(auth_client: TestClient, auth_token: str):
         assert len(result["snippets"]) <= 3
 
 
-def test_search_notes_empty_query(auth_client: TestClient, auth_token: str):
+def test_search_notes_empty_query(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test search with empty query returns no results."""
     response = auth_client.get(
         "/api/v1/notes/search/",
         params={"q": ""},
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -77,12 +79,12 @@ def test_search_notes_empty_query(auth_client: TestClient, auth_token: str):
     assert data["total"] == 0
 
 
-def test_search_notes_no_results(auth_client: TestClient, auth_token: str):
+def test_search_notes_no_results(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test search with query that matches nothing."""
     response = auth_client.get(
         "/api/v1/notes/search/",
         params={"q": "xyzabc123nonexistent"},
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -91,12 +93,12 @@ def test_search_notes_no_results(auth_client: TestClient, auth_token: str):
     assert data["total"] == 0
 
 
-def test_search_notes_multi_phrase(auth_client: TestClient, auth_token: str):
+def test_search_notes_multi_phrase(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test search with multiple phrases."""
     response = auth_client.get(
         "/api/v1/notes/search/",
         params={"q": "test note"},
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -105,17 +107,17 @@ def test_search_notes_multi_phrase(auth_client: TestClient, auth_token: str):
     assert "total" in data
 
 
-def test_search_notes_case_insensitive(auth_client: TestClient, auth_token: str):
+def test_search_notes_case_insensitive(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test search is case-insensitive."""
     response1 = auth_client.get(
         "/api/v1/notes/search/",
         params={"q": "TEST"},
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     response2 = auth_client.get(
         "/api/v1/notes/search/",
         params={"q": "test"},
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     
     assert response1.status_code == 200
@@ -128,12 +130,12 @@ def test_search_notes_case_insensitive(auth_client: TestClient, auth_token: str)
     assert data1["total"] == data2["total"]
 
 
-def test_search_notes_limit_parameter(auth_client: TestClient, auth_token: str):
+def test_search_notes_limit_parameter(auth_client: TestClient, auth_headers: Dict[str, str]):
     """Test search respects the limit parameter."""
     response = auth_client.get(
         "/api/v1/notes/search/",
         params={"q": "note", "limit": 1},
-        headers={"Authorization": f"Bearer {auth_token}"}
+        headers=auth_headers
     )
     assert response.status_code == 200
     
@@ -150,3 +152,64 @@ def test_search_without_auth_fails(client: TestClient):
     # Should return 401 or 403 (authentication/authorization error)
     assert response.status_code in [401, 403]
 
+
+def test_search_reflects_new_notes(auth_client: TestClient, auth_headers: Dict[str, str]):
+    """Test that repeating a search after creating a note finds the new note."""
+    params = {"q": "uniquesearchterm"}
+
+    response = auth_client.get("/api/v1/notes/search/", params=params, headers=auth_headers)
+    assert response.json()["total"] == 0
+
+    response = auth_client.post(
+        "/api/v1/notes/subdir/fresh.md",
+        json={"content": "contains uniquesearchterm"},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+
+    response = auth_client.get("/api/v1/notes/search/", params=params, headers=auth_headers)
+    data = response.json()
+    assert data["total"] == 1
+    assert data["results"][0]["path"] == "/subdir/fresh.md"
+
+
+def test_search_reflects_nested_directory_delete(auth_client: TestClient, auth_headers: Dict[str, str]):
+    """Test that a search repeated after deleting a nested directory drops its notes."""
+    params = {"q": "nesteddeleteterm"}
+
+    response = auth_client.post(
+        "/api/v1/notes/outer/inner/gone.md",
+        json={"content": "contains nesteddeleteterm"},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+
+    response = auth_client.get("/api/v1/notes/search/", params=params, headers=auth_headers)
+    assert [r["path"] for r in response.json()["results"]] == ["/outer/inner/gone.md"]
+
+    response = auth_client.delete(
+        "/api/v1/directories/outer/inner",
+        params={"recursive": True},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+
+    response = auth_client.get("/api/v1/notes/search/", params=params, headers=auth_headers)
+    assert response.json()["total"] == 0
+
+
+def test_search_non_ascii_phrase_case_insensitive(auth_client: TestClient, auth_headers: Dict[str, str]):
+    """Test that non-ASCII phrases match regardless of case, with line numbers."""
+    response = auth_client.post(
+        "/api/v1/notes/cafe.md",
+        json={"content": "first line\nCAFÉ menu\nsecond\ncafé latte\n"},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+
+    response = auth_client.get("/api/v1/notes/search/", params={"q": "Café"}, headers=auth_headers)
+    data = response.json()
+    assert data["total"] == 1
+    snippets = data["results"][0]["snippets"]
+    assert [s["line_number"] for s in snippets] == [2, 4]
+    assert snippets[0]["content"] == "CAFÉ menu"